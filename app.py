@@ -1,8 +1,9 @@
 import os
+import resource
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, jsonify, request
 from bs4 import BeautifulSoup
-import requests
+import http_client
 from sumy.parsers.plaintext import PlaintextParser
 from sumy.nlp.tokenizers import Tokenizer
 from sumy.summarizers.lsa import LsaSummarizer
@@ -10,7 +11,10 @@ from sumy.utils import get_stop_words
 import re
 import nltk
 import concurrent.futures
+import threading
+import time
 from dotenv import load_dotenv
+from urllib.parse import urlparse
 
 load_dotenv()
 
@@ -48,6 +52,74 @@ from scraper_financial import fetch_financial_express_headlines, fetch_article_c
 # Integrating News18Scraper
 from scraper_news18 import News18Scraper
 
+# Headless rendering, used only when a listing's static HTML has too few links
+from renderer import render_page
+
+# Shared NLP preprocessing, run once per digest over all of its articles
+from nlp_preprocess import preprocess_batch
+
+# Serialized digests shared by the /fetch-* routes
+from digest_cache import DigestCache
+from cache_manager import cache_manager
+
+digest_cache = DigestCache('digests')
+
+# Full-text index over every article ingested by the digests
+from search_index import ArticleIndex
+
+article_index = ArticleIndex()
+
+# Headline digests carry no article text. With BACKFILL_ARTICLES=1 their articles are
+# queued for the crawl workers, which fetch, summarize and index them off the request path
+# so /search covers full articles. Only turn it on where something drains the queue:
+#   BACKFILL_ARTICLES=1 gunicorn app:app
+#   python crawl_worker.py work --processes 2
+# run on the same host (or with CRAWL_QUEUE_DB and NEWSAPP_DB on a shared filesystem).
+# Off by default because nothing else consumes the queue and it would only keep growing.
+from work_queue import WorkQueue
+
+BACKFILL_ARTICLES = os.getenv("BACKFILL_ARTICLES", "0") == "1"
+
+# Fields of an ingested article that are sent to the browser
+DIGEST_FIELDS = ('headline', 'url', 'source', 'summary')
+
+# Per-source circuit breakers and the overall time budget for one digest refresh
+from circuit_breaker import CircuitBreaker
+from deadline import Deadline, out_of_time
+
+circuit_breakers = {source: CircuitBreaker(source) for source in ('hindu', 'mint', 'financial', 'news18')}
+
+# Stays under gunicorn's default 30s worker timeout
+DIGEST_DEADLINE = float(os.getenv("DIGEST_DEADLINE", 25))
+
+# Summaries computed on demand by /summary, served as pre-serialized bytes like the digests
+SUMMARY_TTL = int(os.getenv("SUMMARY_TTL", 86400))
+SUMMARY_DEADLINE = float(os.getenv("SUMMARY_DEADLINE", 15))
+
+summary_cache = DigestCache('summaries', ttl=SUMMARY_TTL, retain=SUMMARY_TTL)
+
+# Articles whose summary just failed are answered with an error until this expires, so a
+# struggling site is not refetched for every card that scrolls into view
+SUMMARY_FAILURE_TTL = int(os.getenv("SUMMARY_FAILURE_TTL", 300))
+failed_summaries = cache_manager.register('failed_summaries', ttl=SUMMARY_FAILURE_TTL)
+
+# Diagnostic routes such as /debug/caches stay off unless explicitly enabled
+DEBUG_ENDPOINTS = os.getenv("DEBUG_ENDPOINTS", "0") == "1"
+
+HINDU_ECONOMY_URL = 'https://www.thehindubusinessline.com/economy/'
+FINANCIAL_ECONOMY_URL = 'https://www.financialexpress.com/about/economy/'
+
+# Placeholders the summarizers return when they fail; never cached as a real summary
+UNAVAILABLE_SUMMARIES = {'Summary not available.', 'Unable to generate summary', 'Error in summary generation'}
+
+# Sources by site hostname: (digest/breaker key, display name)
+SOURCE_SITES = {
+    'thehindubusinessline.com': ('hindu', 'The Hindu BusinessLine'),
+    'livemint.com': ('mint', 'Mint'),
+    'financialexpress.com': ('financial', 'Financial Express'),
+    'news18.com': ('news18', 'News18'),
+}
+
 # Function to clean article content
 def clean_article_content(content):
     content = re.sub(r'[0-9]+(?:\.[0-9]+)?', '', content)  # Remove numbers
@@ -61,7 +133,7 @@ def fetch_thehindu_headlines(url, limit=5):
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.content, 'html.parser')
@@ -88,8 +160,11 @@ def fetch_article_details(url):
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
+        if out_of_time('parse'):
+            print(f"Skipping {url}: no time left to parse it")
+            return None, "No time available"
 
         soup = BeautifulSoup(response.content, 'html.parser')
         paragraphs = soup.find_all('p')
@@ -111,13 +186,22 @@ def fetch_mint_headlines(url="https://www.livemint.com/latest-news", limit=5):
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.content, 'html.parser')
         headlines = []
 
         containers = soup.find_all('div', class_='listingNew', limit=limit)
+
+        # Listing rendered client-side: fall back to the headless browser pool
+        if len(containers) < limit:
+            html = render_page(url)
+            if html:
+                rendered = BeautifulSoup(html, 'html.parser').find_all('div', class_='listingNew', limit=limit)
+                if len(rendered) > len(containers):
+                    containers = rendered
+
         for container in containers:
             title_element = container.find('h2')
             link_element = title_element.find('a') if title_element else None
@@ -138,103 +222,454 @@ def fetch_mint_headlines(url="https://www.livemint.com/latest-news", limit=5):
 def home():
     return render_template('index.html')
 
-# Route to fetch news from The Hindu BusinessLine
-@app.route('/fetch-hindu-news', methods=['GET'])
-def fetch_hindu_news():
-    base_url = 'https://www.thehindubusinessline.com/economy/'
-    headlines = fetch_thehindu_headlines(base_url, limit=5)
+# Function to serve a cached digest as pre-serialized bytes
+def digest_response(entry, stale=False):
+    if entry.etag in request.if_none_match:
+        response = Response(status=304)
+    elif 'gzip' in request.accept_encodings:
+        response = Response(entry.gzipped, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Content-Length'] = str(len(entry.gzipped))
+    else:
+        response = Response(entry.body, mimetype='application/json')
+        response.headers['Content-Length'] = str(len(entry.body))
+
+    response.headers['ETag'] = f'"{entry.etag}"'
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Vary'] = 'Accept-Encoding'
+    if stale:
+        response.headers['X-Digest-Stale'] = '1'
+    return response
+
+# Function to run a digest builder, index its articles and queue any still missing their text
+def ingest_digest(builder):
+    articles = builder()
+    if articles is None:
+        return None
 
-    if not headlines:
-        return jsonify({'error': 'No headlines found for The Hindu BusinessLine.'}), 500
+    try:
+        article_index.add_articles(articles)
+    except Exception as e:
+        print(f"Error indexing articles: {str(e)}")
 
-    news_data = []
+    try:
+        queue_article_backfill(articles)
+    except Exception as e:
+        print(f"Error queueing articles for crawl: {str(e)}")
+
+    return [{field: article[field] for field in DIGEST_FIELDS} for article in articles]
+
+# Function to queue articles that have no stored text yet, once per URL, for the crawl workers
+def queue_article_backfill(articles):
+    pending = [article for article in articles if not article.get('body') and not article.get('summary')]
+    if not BACKFILL_ARTICLES or not pending:
+        return
+
+    queue = WorkQueue()
+    try:
+        for article in pending:
+            # Same key as crawl_worker's own article jobs, so each article is crawled once
+            queue.enqueue('article', {
+                'source': article['source'],
+                'url': article['url'],
+                'headline': article['headline'],
+                'published': article.get('published'),
+            }, dedupe_key=f"article:{article['url']}")
+    finally:
+        queue.close()
+
+# Function to rebuild a digest within the deadline, reporting the outcome to the source's breaker
+def refresh_digest(source, builder, probe=False):
+    # Requests that queued for the rebuild while the circuit opened must not hit the source
+    if not probe and not circuit_breakers[source].allow_request():
+        return None
+
+    started = time.monotonic()
+    try:
+        with Deadline(DIGEST_DEADLINE):
+            articles = ingest_digest(builder)
+    except Exception as e:
+        print(f"Error refreshing {source} digest: {str(e)}")
+        articles = None
+
+    # An empty digest is a failure too: it must not replace the last good one
+    circuit_breakers[source].record(bool(articles), time.monotonic() - started)
+    return articles or None
+
+# Function to return a source's digest, rebuilding it only when it has expired
+def serve_digest(source, builder, error_message, mode='full'):
+    cache_key = source if mode == 'full' else f"{source}:{mode}"
+    entry = digest_cache.get(cache_key)
+    if entry and entry.age() < digest_cache.ttl:
+        return digest_response(entry)
+
+    breaker = circuit_breakers[source]
+    if breaker.allow_request():
+        refreshed = digest_cache.refresh(cache_key, lambda: refresh_digest(source, builder))
+        if refreshed:
+            return digest_response(refreshed)
+    elif breaker.try_probe():
+        # Probe the source off the request path; this request gets the last good digest
+        threading.Thread(
+            target=digest_cache.refresh,
+            args=(cache_key, lambda: refresh_digest(source, builder, probe=True)),
+            daemon=True
+        ).start()
+
+    if entry is None:
+        status = 500 if breaker.allow_request() else 503
+        return jsonify({'error': error_message}), status
+    return digest_response(entry, stale=True)
+
+# Function to summarize an article only if the deadline leaves time for it; the summary is
+# otherwise left empty and computed later through /summary
+def summarize_within_deadline(content):
+    if out_of_time('summarize'):
+        print("Skipping summary: no time left to summarize")
+        return None
+    return summarize_article_sumy(content)
+
+# Function to summarize a digest's fetched articles: their text is preprocessed as one batch,
+# then each is summarized while the deadline allows (None once it does not)
+def summarize_batch(contents, summarizer=summarize_article_sumy):
+    if contents and not out_of_time('summarize'):
+        preprocess_batch(contents)
+    return [None if out_of_time('summarize') else summarizer(content) for content in contents]
+
+# Function to build the digest for The Hindu BusinessLine
+def build_hindu_digest():
+    headlines = fetch_thehindu_headlines(HINDU_ECONOMY_URL, limit=5)
+
+    if not headlines:
+        return None
 
+    fetched = []
     for headline_info in headlines:
+        if out_of_time('fetch'):
+            break
         article_content, published_time = fetch_article_details(headline_info['url'])
-        if not article_content:
-            continue
-        summary = summarize_article_sumy(article_content)
-        news_data.append({
+        if article_content:
+            fetched.append((headline_info, article_content, published_time))
+
+    summaries = summarize_batch([content for _, content, _ in fetched])
+    return [
+        {
             'headline': headline_info['headline'],
             'url': headline_info['url'],
             'source': 'The Hindu BusinessLine',
-            'summary': summary
-        })
-
-    return jsonify(news_data)
+            'summary': summary,
+            'body': article_content,
+            'published': published_time
+        }
+        for (headline_info, article_content, published_time), summary in zip(fetched, summaries)
+    ]
 
-# Route to fetch news from Mint
-@app.route('/fetch-mint-news', methods=['GET'])
-def fetch_mint_news():
+# Function to build the digest for Mint
+def build_mint_digest():
     headlines = fetch_mint_headlines(limit=5)
 
     if not headlines:
-        return jsonify({'error': 'No headlines found for Mint.'}), 500
-
-    news_data = []
+        return None
 
+    fetched = []
     for headline_info in headlines:
+        if out_of_time('fetch'):
+            break
         article_content = fetch_article_details(headline_info['url'])[0]
-        if not article_content:
-            continue
-        summary = summarize_article_sumy(article_content)
-        news_data.append({
+        if article_content:
+            fetched.append((headline_info, article_content))
+
+    summaries = summarize_batch([content for _, content in fetched])
+    return [
+        {
             'headline': headline_info['headline'],
             'url': headline_info['url'],
             'source': 'Mint',
-            'summary': summary
-        })
+            'summary': summary,
+            'body': article_content,
+            'published': headline_info['time']
+        }
+        for (headline_info, article_content), summary in zip(fetched, summaries)
+    ]
 
-    return jsonify(news_data)
+# Function to build the digest for Financial Express
+def build_financial_digest():
+    headlines = fetch_financial_express_headlines(FINANCIAL_ECONOMY_URL, limit=5)
 
-# Route to fetch news from Financial Express
-@app.route('/fetch-financial-news', methods=['GET'])
-def fetch_financial_news():
-    base_url = 'https://www.financialexpress.com/about/economy/'
-    headlines = fetch_financial_express_headlines(base_url, limit=5)
+    if not headlines:
+        return None
+
+    fetched = []
+    for headline_info in headlines:
+        if out_of_time('fetch'):
+            break
+        article_content = fetch_article_content(headline_info['url'])
+        if not article_content.startswith("Error"):
+            fetched.append((headline_info, article_content))
+
+    summaries = summarize_batch([content for _, content in fetched])
+    return [
+        {
+            'headline': headline_info['headline'],
+            'url': headline_info['url'],
+            'source': 'Financial Express',
+            'summary': summary,
+            'body': article_content,
+            'published': headline_info['time']
+        }
+        for (headline_info, article_content), summary in zip(fetched, summaries)
+    ]
+
+# Function to build the digest for News18
+def build_news18_digest():
+    scraper = News18Scraper()
+    fetched = []
+    seen = set()
+
+    links_by_category = scraper.get_links_by_category(limit=5)
 
+    for category, links in links_by_category.items():
+        print(f"Scraping category: {category}")
+
+        for link in links:
+            # Links shared by several categories are extracted once
+            if link in seen:
+                continue
+            seen.add(link)
+            if out_of_time('fetch'):
+                break
+
+            article_data = scraper.extract_article_data(link, summarize=False)
+            if article_data:
+                fetched.append(article_data)
+
+    summaries = summarize_batch([article_data['content'] for article_data in fetched], scraper.generate_summary)
+    return [
+        {
+            'headline': article_data['headline'],
+            'url': article_data['link'],
+            'source': 'News18',
+            'summary': summary,
+            'body': article_data['content'],
+            'published': article_data['publish_date']
+        }
+        for article_data, summary in zip(fetched, summaries)
+    ]
+
+# Function to look up a usable stored summary for an article
+def known_summary(url):
+    summary = article_index.get_summary(url)
+    return summary if summary not in UNAVAILABLE_SUMMARIES else None
+
+# Function to turn section-page headlines into a digest, with summaries left to /summary
+def headline_digest(headlines, source):
     if not headlines:
-        return jsonify({'error': 'No headlines found for Financial Express.'}), 500
+        return None
 
     news_data = []
-
     for headline_info in headlines:
-        article_content = fetch_article_content(headline_info['url'])
-        if article_content.startswith("Error"):
+        if not headline_info['url'].startswith('http'):
             continue
-        summary = summarize_article_sumy(article_content)
         news_data.append({
             'headline': headline_info['headline'],
             'url': headline_info['url'],
-            'source': 'Financial Express',
-            'summary': summary
+            'source': source,
+            # Summaries already computed for this article are sent right away
+            'summary': known_summary(headline_info['url']),
+            'published': headline_info.get('time')
         })
 
-    return jsonify(news_data)
+    return news_data
 
-# Route to fetch news from News18
-@app.route('/fetch-news18-news', methods=['GET'])
-def fetch_news18_news():
+# Functions to build headline-only digests from a single section-page scrape
+def build_hindu_headlines():
+    return headline_digest(fetch_thehindu_headlines(HINDU_ECONOMY_URL, limit=5), 'The Hindu BusinessLine')
+
+def build_mint_headlines():
+    return headline_digest(fetch_mint_headlines(limit=5), 'Mint')
+
+def build_financial_headlines():
+    return headline_digest(fetch_financial_express_headlines(FINANCIAL_ECONOMY_URL, limit=5), 'Financial Express')
+
+def build_news18_headlines():
     scraper = News18Scraper()
-    news_data = []
+    headlines = []
+    seen = set()
 
     for category, path in scraper.categories.items():
-        print(f"Scraping category: {category}")
-        links = scraper.get_article_links(scraper.base_url + path, category, limit=5)
+        if out_of_time('fetch'):
+            break
+        try:
+            category_headlines = scraper.discover_article_headlines(scraper.base_url + path, limit=5)
+        except Exception as e:
+            print(f"Error getting {category} headlines: {str(e)}")
+            continue
+        for headline_info in category_headlines:
+            if headline_info['url'] not in seen:
+                seen.add(headline_info['url'])
+                headlines.append(headline_info)
+
+    return headline_digest(headlines, 'News18')
+
+# Function to fetch and summarize one article into an index record
+def fetch_and_summarize(source, url, headline=None, published=None):
+    if source == 'News18':
+        # Fetch errors raise so callers can retry; None means the page is not a usable article
+        article_data = News18Scraper().extract_article_data(url, raise_errors=True)
+        if not article_data:
+            return None
+        headline = article_data['headline']
+        content = article_data['content']
+        summary = article_data['summary']
+        published = article_data['publish_date']
+    else:
+        if source == 'Financial Express':
+            content = fetch_article_content(url)
+            if content.startswith("Error"):
+                raise RuntimeError(content)
+        else:
+            content, details_time = fetch_article_details(url)
+            if not content:
+                raise RuntimeError(f"No content fetched from {url}")
+            published = published or details_time
+        summary = summarize_within_deadline(content)
+
+    return {
+        'headline': headline,
+        'url': url,
+        'source': source,
+        'summary': summary,
+        'body': content,
+        'published': published
+    }
+
+# Function to find which source an article URL belongs to
+def source_for_url(url):
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        return None
+    for site, source in SOURCE_SITES.items():
+        if parsed.hostname == site or parsed.hostname.endswith('.' + site):
+            return source
+    return None
+
+# Function to compute the summary of one article, reusing a stored one when available
+def build_summary(source_key, source, url):
+    stored = known_summary(url)
+    if stored:
+        return {'url': url, 'summary': stored}
+
+    if failed_summaries.get(url):
+        return None
+
+    # While the circuit is open, only the single half-open probe reaches the site
+    breaker = circuit_breakers[source_key]
+    if not (breaker.allow_request() or breaker.try_probe()):
+        return None
+
+    started = time.monotonic()
+    fetched = True
+    try:
+        with Deadline(SUMMARY_DEADLINE):
+            record = fetch_and_summarize(source, url)
+    except Exception as e:
+        print(f"Error summarizing {url}: {str(e)}")
+        record = None
+        fetched = False
+    # The breaker judges the site, so an article fetched but too short to summarize still counts as a success
+    breaker.record(fetched, time.monotonic() - started)
 
-        for link in links:
-            article_data = scraper.extract_article_data(link)
-            if article_data:
-                news_data.append({
-                    'headline': article_data['headline'],
-                    'url': article_data['link'],
-                    'source': 'News18',
-                    'summary': article_data['summary']
-                })
+    if not record or not record['summary'] or record['summary'] in UNAVAILABLE_SUMMARIES:
+        failed_summaries.set(url, True)
+        return None
 
-    return jsonify(news_data)
+    try:
+        article_index.update_summary(url, record['summary'], record['body'])
+    except Exception as e:
+        print(f"Error storing summary: {str(e)}")
+    return {'url': url, 'summary': record['summary']}
 
+# Function to tell whether the client asked for the headline-only fast path
+def headlines_requested():
+    return request.args.get('mode') == 'headlines'
 
+# Route to fetch news from The Hindu BusinessLine
+@app.route('/fetch-hindu-news', methods=['GET'])
+def fetch_hindu_news():
+    if headlines_requested():
+        return serve_digest('hindu', build_hindu_headlines, 'No headlines found for The Hindu BusinessLine.', mode='headlines')
+    return serve_digest('hindu', build_hindu_digest, 'No headlines found for The Hindu BusinessLine.')
+
+# Route to fetch news from Mint
+@app.route('/fetch-mint-news', methods=['GET'])
+def fetch_mint_news():
+    if headlines_requested():
+        return serve_digest('mint', build_mint_headlines, 'No headlines found for Mint.', mode='headlines')
+    return serve_digest('mint', build_mint_digest, 'No headlines found for Mint.')
+
+# Route to fetch news from Financial Express
+@app.route('/fetch-financial-news', methods=['GET'])
+def fetch_financial_news():
+    if headlines_requested():
+        return serve_digest('financial', build_financial_headlines, 'No headlines found for Financial Express.', mode='headlines')
+    return serve_digest('financial', build_financial_digest, 'No headlines found for Financial Express.')
+
+# Route to fetch news from News18
+@app.route('/fetch-news18-news', methods=['GET'])
+def fetch_news18_news():
+    if headlines_requested():
+        return serve_digest('news18', build_news18_headlines, 'No articles found for News18.', mode='headlines')
+    return serve_digest('news18', build_news18_digest, 'No articles found for News18.')
+
+# Route to summarize one article on demand, e.g. /summary?url=https://www.livemint.com/...
+@app.route('/summary', methods=['GET'])
+def article_summary():
+    url = request.args.get('url', '').strip()
+    source = source_for_url(url)
+    if source is None:
+        return jsonify({'error': 'Unsupported article URL.'}), 400
+
+    source_key, source_name = source
+    entry = summary_cache.get_or_refresh(url, lambda: build_summary(source_key, source_name, url))
+    if entry is None:
+        status = 502 if circuit_breakers[source_key].allow_request() else 503
+        return jsonify({'error': 'Summary not available.'}), status
+
+    response = digest_response(entry)
+    # A summary does not change, so browsers may reuse it without revalidating
+    response.headers['Cache-Control'] = f'public, max-age={SUMMARY_TTL}'
+    return response
+
+# Route to search stored articles, e.g. /search?q=gold+price&source=Mint&from=2025-01-01&page=2
+@app.route('/search', methods=['GET'])
+def search_articles():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Missing search query.'}), 400
+
+    page = request.args.get('page', 1, type=int)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+
+    results = article_index.search(
+        query,
+        source=request.args.get('source'),
+        date_from=request.args.get('from'),
+        date_to=request.args.get('to'),
+        page=page,
+        per_page=per_page
+    )
+    return jsonify(results)
+
+# Route to inspect cache memory use and source circuit breakers in a running worker;
+# only served when DEBUG_ENDPOINTS=1
+@app.route('/debug/caches', methods=['GET'])
+def debug_caches():
+    if not DEBUG_ENDPOINTS:
+        return jsonify({'error': 'Not found.'}), 404
+    stats = cache_manager.stats()
+    stats['max_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    stats['circuit_breakers'] = {source: breaker.snapshot() for source, breaker in circuit_breakers.items()}
+    return jsonify(stats)
 
 
 
@@ -0,0 +1,179 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Total bytes all registered caches may hold in one worker process
+CACHE_BUDGET_BYTES = int(float(os.getenv("CACHE_BUDGET_MB", 64)) * 1024 * 1024)
+
+# Bookkeeping per cached entry on top of its key and value: the OrderedDict node and hash
+# slot plus the (value, size, stored_at, last_used) tuple and its float objects
+ENTRY_OVERHEAD = 200
+
+
+def approx_size(value):
+    """Rough in-memory size of a cached value, counting containers one level deep"""
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value) + 50
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(approx_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class ManagedCache:
+    """
+    A key/value cache registered with a CacheManager. Entries expire after ttl seconds
+    (if set) and are evicted least-recently-used first whenever the manager's global
+    byte budget is exceeded.
+    """
+
+    def __init__(self, manager, name, ttl=None, sizeof=approx_size):
+        self.manager = manager
+        self.name = name
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self._entries = OrderedDict()  # key -> (value, size, stored_at, last_used), LRU first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self.manager.lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, size, stored_at, _ = item
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries[key] = (value, size, stored_at, time.monotonic())
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        size = self.sizeof(key) + self.sizeof(value) + ENTRY_OVERHEAD
+        with self.manager.lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.manager.budget:
+                return
+            self._entries[key] = (value, size, time.time(), time.monotonic())
+            self.bytes += size
+            self.manager.used += size
+            self.manager.enforce_budget()
+
+    def peek(self, key, default=None):
+        """Like get, but without touching recency or statistics; for re-checks of a lookup already counted"""
+        with self.manager.lock:
+            item = self._entries.get(key)
+            if item is None or (self.ttl is not None and time.time() - item[2] > self.ttl):
+                return default
+            return item[0]
+
+    def pop(self, key, default=None):
+        with self.manager.lock:
+            if key not in self._entries:
+                return default
+            value = self._entries[key][0]
+            self._remove(key)
+            return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self.manager.lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def _remove(self, key):
+        _, size, _, _ = self._entries.pop(key)
+        self.bytes -= size
+        self.manager.used -= size
+
+    def _oldest_use(self):
+        if not self._entries:
+            return None
+        return next(iter(self._entries.values()))[3]
+
+    def _evict_oldest(self):
+        key = next(iter(self._entries))
+        self._remove(key)
+        self.evictions += 1
+
+    def purge_expired(self):
+        if self.ttl is None:
+            return
+        cutoff = time.time() - self.ttl
+        with self.manager.lock:
+            for key in [k for k, item in self._entries.items() if item[2] < cutoff]:
+                self._remove(key)
+                self.expirations += 1
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+_MISSING = object()
+
+
+class CacheManager:
+    """Owns every cache in the process and keeps their combined size under one budget"""
+
+    def __init__(self, budget=CACHE_BUDGET_BYTES):
+        self.budget = budget
+        self.used = 0
+        self.lock = threading.RLock()
+        self.caches = {}
+
+    def register(self, name, ttl=None, sizeof=approx_size):
+        with self.lock:
+            if name in self.caches:
+                return self.caches[name]
+            cache = ManagedCache(self, name, ttl=ttl, sizeof=sizeof)
+            self.caches[name] = cache
+            return cache
+
+    def enforce_budget(self):
+        """Drop expired entries, then least-recently-used entries across all caches"""
+        with self.lock:
+            if self.used <= self.budget:
+                return
+            for cache in self.caches.values():
+                cache.purge_expired()
+            while self.used > self.budget:
+                candidates = [c for c in self.caches.values() if c._entries]
+                if not candidates:
+                    break
+                min(candidates, key=lambda c: c._oldest_use())._evict_oldest()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'budget_bytes': self.budget,
+                'used_bytes': self.used,
+                'caches': {name: cache.stats() for name, cache in self.caches.items()},
+            }
+
+
+cache_manager = CacheManager()
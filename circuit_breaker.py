@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Tracks the outcome and latency of recent refreshes of one source. The circuit opens
+    when too many recent calls failed or were slow; while open, callers fail fast. After
+    a cool-down a single probe is let through (half-open): success closes the circuit,
+    failure reopens it with a doubled cool-down, up to max_open_seconds.
+    """
+
+    def __init__(self, name, window=10, min_calls=3, failure_rate=0.5, slow_call_seconds=15.0,
+                 slow_call_rate=0.8, open_seconds=30.0, max_open_seconds=600.0):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.base_open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+
+        self.calls = deque(maxlen=window)  # (succeeded, latency) per call
+        self.state = CLOSED
+        self.open_seconds = open_seconds
+        self.opened_at = 0.0
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def _current_state(self):
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.open_seconds:
+            self.state = HALF_OPEN
+        return self.state
+
+    def allow_request(self):
+        """True when callers may hit the source directly (circuit closed)"""
+        with self._lock:
+            return self._current_state() == CLOSED
+
+    def try_probe(self):
+        """True for exactly one caller once the cool-down has elapsed"""
+        with self._lock:
+            if self._current_state() != HALF_OPEN or self.probing:
+                return False
+            self.probing = True
+            return True
+
+    def record(self, succeeded, latency):
+        with self._lock:
+            was_probe = self.probing
+            self.probing = False
+
+            if was_probe:
+                if succeeded:
+                    self._close()
+                else:
+                    self._open(min(self.open_seconds * 2, self.max_open_seconds))
+                return
+
+            self.calls.append((succeeded, latency))
+            if self.state == CLOSED and self._should_trip():
+                self._open(self.base_open_seconds)
+
+    def _should_trip(self):
+        if len(self.calls) < self.min_calls:
+            return False
+        failures = sum(1 for succeeded, _ in self.calls if not succeeded)
+        slow = sum(1 for _, latency in self.calls if latency >= self.slow_call_seconds)
+        return (failures / len(self.calls) >= self.failure_rate
+                or slow / len(self.calls) >= self.slow_call_rate)
+
+    def _open(self, seconds):
+        print(f"Circuit for {self.name} opened for {seconds:g}s")
+        self.state = OPEN
+        self.open_seconds = seconds
+        self.opened_at = time.monotonic()
+
+    def _close(self):
+        print(f"Circuit for {self.name} closed")
+        self.state = CLOSED
+        self.open_seconds = self.base_open_seconds
+        self.calls.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'state': self._current_state(),
+                'recent_calls': len(self.calls),
+                'recent_failures': sum(1 for succeeded, _ in self.calls if not succeeded),
+                'open_seconds': self.open_seconds,
+            }
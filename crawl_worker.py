@@ -0,0 +1,136 @@
+import argparse
+import multiprocessing
+import os
+import socket
+import time
+
+from app import (
+    HINDU_ECONOMY_URL,
+    FINANCIAL_ECONOMY_URL,
+    fetch_thehindu_headlines,
+    fetch_mint_headlines,
+    fetch_financial_express_headlines,
+    fetch_and_summarize,
+)
+from scraper_news18 import News18Scraper
+from search_index import ArticleIndex
+from work_queue import WorkQueue
+
+news18 = News18Scraper()
+
+# Section pages crawled on every seed, per source
+SECTION_PAGES = {
+    'The Hindu BusinessLine': [HINDU_ECONOMY_URL],
+    'Mint': ['https://www.livemint.com/latest-news'],
+    'Financial Express': [FINANCIAL_ECONOMY_URL],
+    'News18': [news18.base_url + path for path in news18.categories.values()],
+}
+
+# How often section pages may be re-crawled (seconds); article pages are crawled once
+SECTION_INTERVAL = int(os.getenv("CRAWL_SECTION_INTERVAL", 900))
+
+
+# Function to list the articles linked from a section page
+def discover_articles(source, url, limit):
+    if source == 'The Hindu BusinessLine':
+        return fetch_thehindu_headlines(url, limit=limit)
+    if source == 'Mint':
+        return fetch_mint_headlines(url, limit=limit)
+    if source == 'Financial Express':
+        return fetch_financial_express_headlines(url, limit=limit)
+    if source == 'News18':
+        links = news18.discover_article_links(url, limit=limit)
+        return [{'headline': None, 'url': link} for link in links]
+    raise ValueError(f"Unknown source: {source}")
+
+
+def seed(queue, limit=5):
+    """Enqueue every section page once per SECTION_INTERVAL window"""
+    window = int(time.time() // SECTION_INTERVAL)
+    added = 0
+    for source, pages in SECTION_PAGES.items():
+        for url in pages:
+            payload = {'source': source, 'url': url, 'limit': limit}
+            if queue.enqueue('section', payload, dedupe_key=f"section:{url}:{window}"):
+                added += 1
+    return added
+
+
+def handle_job(job, queue, index):
+    payload = job.payload
+    if job.kind == 'section':
+        articles = discover_articles(payload['source'], payload['url'], payload['limit'])
+        if not articles:
+            raise RuntimeError(f"No articles found on {payload['url']}")
+        for article in articles:
+            if not article['url'].startswith('http'):
+                continue
+            # Keyed by URL so a link listed on several section pages is crawled once
+            queue.enqueue('article', {
+                'source': payload['source'],
+                'url': article['url'],
+                'headline': article.get('headline'),
+                'published': article.get('time'),
+            }, dedupe_key=f"article:{article['url']}")
+    elif job.kind == 'article':
+        record = fetch_and_summarize(payload['source'], payload['url'], payload.get('headline'), payload.get('published'))
+        if record:
+            index.add_articles([record])
+    else:
+        raise ValueError(f"Unknown job kind: {job.kind}")
+
+
+def run_worker(poll_interval=2.0, exit_when_idle=False):
+    """Lease and run jobs until stopped (or until the queue is drained with exit_when_idle)"""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    queue = WorkQueue()
+    index = ArticleIndex()
+    print(f"Worker {worker_id} started")
+
+    while True:
+        job = queue.lease(worker_id)
+        if job is None:
+            if exit_when_idle:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        try:
+            handle_job(job, queue, index)
+            queue.complete(job, worker_id)
+        except Exception as e:
+            print(f"Job {job.id} ({job.kind}) failed on attempt {job.attempts}: {str(e)}")
+            queue.fail(job, worker_id, e)
+
+    queue.close()
+    print(f"Worker {worker_id} finished")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Queue-based crawl of all news sources")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = subparsers.add_parser('seed', help="Enqueue section pages for all sources")
+    seed_parser.add_argument('--limit', type=int, default=5, help="Articles to take from each section page")
+
+    work_parser = subparsers.add_parser('work', help="Run worker processes on this machine")
+    work_parser.add_argument('--processes', type=int, default=os.cpu_count())
+    work_parser.add_argument('--exit-when-idle', action='store_true')
+
+    subparsers.add_parser('stats', help="Show job counts by status")
+
+    args = parser.parse_args()
+
+    if args.command == 'seed':
+        print(f"Enqueued {seed(WorkQueue(), limit=args.limit)} section jobs")
+    elif args.command == 'stats':
+        print(WorkQueue().stats())
+    else:
+        workers = [
+            multiprocessing.Process(target=run_worker, kwargs={'exit_when_idle': args.exit_when_idle})
+            for _ in range(args.processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
@@ -0,0 +1,53 @@
+import threading
+import time
+
+# Share of a request's total budget reserved for each pipeline stage, in pipeline order
+STAGE_SHARES = (('fetch', 0.6), ('parse', 0.15), ('summarize', 0.25))
+
+_local = threading.local()
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Deadline:
+    """
+    An overall time budget for one digest request. While active (used as a context
+    manager) it caps every outgoing HTTP timeout on the current thread, and a stage may
+    only use the time left after reserving the shares of the stages that follow it.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def budget(self, stage):
+        """Seconds the given stage may still spend without eating into later stages"""
+        stages = [name for name, _ in STAGE_SHARES]
+        later = stages[stages.index(stage) + 1:]
+        reserved = sum(share for name, share in STAGE_SHARES if name in later) * self.seconds
+        return max(0.0, self.remaining() - reserved)
+
+    def __enter__(self):
+        self._previous = getattr(_local, 'deadline', None)
+        _local.deadline = self
+        return self
+
+    def __exit__(self, *exc):
+        _local.deadline = self._previous
+        return False
+
+
+def current_deadline():
+    """The deadline active on this thread, or None outside a budgeted request"""
+    return getattr(_local, 'deadline', None)
+
+
+def out_of_time(stage='fetch'):
+    """True when the active deadline leaves no budget for the given stage"""
+    deadline = current_deadline()
+    return deadline is not None and deadline.budget(stage) <= 0
@@ -0,0 +1,95 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+from cache_manager import cache_manager
+
+# How long a refreshed digest is served before it is rebuilt (seconds)
+DIGEST_TTL = int(os.getenv("DIGEST_TTL", 900))
+
+# Rebuild locks are striped so per-URL caches do not grow one lock per key forever
+LOCK_STRIPES = 64
+
+
+class DigestEntry:
+    """A source digest serialized once into the exact bytes the routes serve."""
+
+    def __init__(self, articles):
+        self.body = json.dumps(articles, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.gzipped = gzip.compress(self.body, compresslevel=6)
+        self.etag = hashlib.sha1(self.body).hexdigest()
+        self.count = len(articles)
+        self.created_at = time.time()
+
+    def age(self):
+        return time.time() - self.created_at
+
+
+def entry_size(value):
+    """Bytes held by a cache key or DigestEntry"""
+    if isinstance(value, DigestEntry):
+        return len(value.body) + len(value.gzipped) + len(value.etag) + 200
+    return len(value) + 50
+
+
+class DigestCache:
+    """
+    Keeps the latest serialized digest per source and rebuilds it when it expires.
+    Entries live in a cache registered with the shared cache manager, so they count
+    against the process-wide memory budget. Expired entries are kept as a stale fallback
+    for up to `retain` seconds (forever if None) unless the budget evicts them first.
+    """
+
+    def __init__(self, name, ttl=DIGEST_TTL, retain=None):
+        self.ttl = ttl
+        self._entries = cache_manager.register(name, ttl=retain, sizeof=entry_size)
+        # When each key's last rebuild failed, so callers queued behind it do not retry at once
+        self._failures = cache_manager.register(f'{name}_failures', ttl=60)
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def _lock_for(self, source):
+        return self._locks[hash(source) % LOCK_STRIPES]
+
+    def get(self, source):
+        """Return the cached entry for a source, fresh or not."""
+        return self._entries.get(source)
+
+    def put(self, source, articles):
+        """Serialize a freshly built digest and make it the current entry."""
+        entry = DigestEntry(articles)
+        self._entries.set(source, entry)
+        return entry
+
+    def get_or_refresh(self, source, builder):
+        """
+        Returns the current entry, calling builder() to rebuild it when missing or expired.
+        Returns None when the builder produces no digest.
+        """
+        entry = self._entries.get(source)
+        if entry and entry.age() < self.ttl:
+            return entry
+        return self.refresh(source, builder)
+
+    def refresh(self, source, builder):
+        """
+        Rebuilds the entry for a source the caller already found missing or expired.
+        Concurrent requests for the same source wait for a single rebuild instead of
+        scraping in parallel, then share its result, including a failure.
+        """
+        waiting_since = time.monotonic()
+        with self._lock_for(source):
+            entry = self._entries.peek(source)
+            if entry and entry.age() < self.ttl:
+                return entry
+            if self._failures.peek(source, 0) >= waiting_since:
+                return None
+
+            articles = builder()
+            if articles is None:
+                self._failures.set(source, time.monotonic())
+                return None
+            self._failures.pop(source)
+            return self.put(source, articles)
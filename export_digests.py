@@ -0,0 +1,150 @@
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+from search_index import DB_PATH
+
+# Stable column order and types for every exported batch
+EXPORT_COLUMNS = {
+    'id': 'int64',
+    'url': 'string',
+    'headline': 'string',
+    'summary': 'string',
+    'body': 'string',
+    'source': 'string',
+    'published': 'string',
+    'digest_date': 'string',
+    'updated_at': 'float64',
+}
+PARTITION_COLUMNS = ['source', 'digest_date']
+
+# Last (updated_at, id) already exported, kept next to the output so reruns only pick up
+# articles inserted or changed since
+STATE_FILE = '_export_state.json'
+
+# Rows written in the last few seconds are left for the next run, so a write that commits
+# slightly after a newer timestamp was exported is not skipped
+SETTLE_SECONDS = 5
+
+
+def load_watermark(output_dir):
+    path = os.path.join(output_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return 0.0, 0
+    with open(path) as f:
+        state = json.load(f)
+    # State from id-only exports cannot see later updates, so those start over
+    if 'updated_at' not in state:
+        return 0.0, 0
+    return state['updated_at'], state['id']
+
+
+def save_watermark(output_dir, updated_at, last_id):
+    path = os.path.join(output_dir, STATE_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump({'updated_at': updated_at, 'id': last_id}, f)
+    os.replace(path + '.tmp', path)
+
+
+def iter_article_batches(db_path, watermark, batch_size, settle=SETTLE_SECONDS):
+    """Yield DataFrames of articles inserted or updated after watermark, in (updated_at, id) order"""
+    after_time, after_id = watermark
+    conn = sqlite3.connect(db_path)
+    try:
+        query = f"""
+            SELECT {', '.join(EXPORT_COLUMNS)} FROM articles
+            WHERE (updated_at > ? OR (updated_at = ? AND id > ?)) AND updated_at <= ?
+            ORDER BY updated_at, id
+        """
+        params = (after_time, after_time, after_id, time.time() - settle)
+        for batch in pd.read_sql_query(query, conn, params=params, chunksize=batch_size):
+            if not batch.empty:
+                yield batch.astype(EXPORT_COLUMNS)
+    finally:
+        conn.close()
+
+
+def partition_dir(output_dir, source, digest_date):
+    # Hive-style directories, readable by pandas, pyarrow, DuckDB and Spark alike
+    safe_source = source.replace('/', '_')
+    return os.path.join(output_dir, f"source={safe_source}", f"digest_date={digest_date}")
+
+
+def read_part(path, fmt):
+    if fmt == 'parquet':
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype={c: t for c, t in EXPORT_COLUMNS.items() if c not in PARTITION_COLUMNS})
+
+
+def write_part(rows, path, fmt):
+    if fmt == 'parquet':
+        rows.to_parquet(path, index=False)
+    else:
+        rows.to_csv(path, index=False)
+
+
+def write_batch(batch, output_dir, fmt):
+    """
+    Merge a batch into each (source, digest_date) partition it touches. An article
+    exported before is replaced by its newer version, so every partition holds one row
+    per article; the partition is rewritten as a single part file.
+    """
+    for (source, digest_date), rows in batch.groupby(PARTITION_COLUMNS, sort=False):
+        directory = partition_dir(output_dir, source, digest_date)
+        os.makedirs(directory, exist_ok=True)
+        old_parts = sorted(glob.glob(os.path.join(directory, f"part-*.{fmt}")))
+
+        rows = rows.drop(columns=PARTITION_COLUMNS)
+        merged = pd.concat([read_part(path, fmt) for path in old_parts] + [rows], ignore_index=True)
+        merged = (
+            merged.sort_values(['id', 'updated_at'], na_position='first', kind='stable')
+            .drop_duplicates('id', keep='last')
+            .reset_index(drop=True)
+        )
+
+        part_name = f"part-{int(merged['id'].min()):010d}-{int(merged['id'].max()):010d}.{fmt}"
+        path = os.path.join(directory, part_name)
+        write_part(merged, path + '.tmp', fmt)
+        os.replace(path + '.tmp', path)
+        # If interrupted here, the next merge of this partition drops the duplicates again
+        for old_path in old_parts:
+            if old_path != path:
+                os.remove(old_path)
+
+
+def export_articles(output_dir, fmt='parquet', db_path=DB_PATH, batch_size=5000):
+    """
+    Exports articles inserted or updated since the last run to output_dir, partitioned
+    by source and digest date. Returns the number of articles exported.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    watermark = load_watermark(output_dir)
+    exported = 0
+
+    for batch in iter_article_batches(db_path, watermark, batch_size):
+        write_batch(batch, output_dir, fmt)
+        last = batch.iloc[-1]
+        watermark = (float(last['updated_at']), int(last['id']))
+        # Checkpoint after each batch so an interrupted export resumes where it stopped
+        save_watermark(output_dir, *watermark)
+        exported += len(batch)
+        print(f"Exported {exported} articles (up to updated_at {watermark[0]:.3f}, id {watermark[1]})")
+
+    return exported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export stored digests for analytics")
+    parser.add_argument('output_dir', help="Directory that receives the partitioned dataset")
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet')
+    parser.add_argument('--db', default=DB_PATH, help="Path to newsapp.db")
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    count = export_articles(args.output_dir, fmt=args.format, db_path=args.db, batch_size=args.batch_size)
+    print(f"Export finished: {count} new or updated articles")
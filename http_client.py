@@ -0,0 +1,38 @@
+import os
+from urllib.parse import urlsplit
+
+import requests
+
+from deadline import DeadlineExceeded, current_deadline
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Upper bound for any single upstream request (seconds), deadline or not
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", 10))
+
+# Base URL of a fixture server that stands in for every upstream site (used by loadtest.py).
+# The original host is passed along in the X-Upstream-Host header.
+UPSTREAM_OVERRIDE = os.getenv("UPSTREAM_OVERRIDE")
+
+# One pooled session per process so repeated fetches from a site reuse connections
+session = requests.Session()
+
+
+# Function to GET an upstream page within the active deadline
+def get(url, headers=None, timeout=REQUEST_TIMEOUT):
+    deadline = current_deadline()
+    if deadline is not None:
+        budget = deadline.budget('fetch')
+        if budget <= 0:
+            raise DeadlineExceeded(f"No time left to fetch {url}")
+        timeout = min(timeout, budget)
+
+    headers = headers or HEADERS
+    if UPSTREAM_OVERRIDE:
+        parts = urlsplit(url)
+        headers = dict(headers, **{'X-Upstream-Host': parts.hostname or ''})
+        url = UPSTREAM_OVERRIDE.rstrip('/') + (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+    return session.get(url, headers=headers, timeout=timeout)
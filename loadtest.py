@@ -0,0 +1,325 @@
+"""
+Load test for the Flask app under gunicorn, with every upstream news site replaced by a
+local fixture server.
+
+    python loadtest.py --users 20 --duration 30 --latency 0.2 \
+        --configs sync:4:1 gthread:4:8 gevent:4:0 --slo-p95 2000
+
+Each config is worker_class:workers:threads. For every config a fresh gunicorn is started
+and driven with concurrent users hitting all routes; throughput and p50/p95/p99 latency are
+reported overall and per route. The exit code is 1 if any config misses the SLOs.
+gevent configs need the gevent package installed.
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+NEWS18_CATEGORY_PATHS = (
+    "/business/economy",
+    "/business/economy/global-economy",
+    "/business/markets/commodities",
+    "/business/markets/commodity/gold-price",
+    "/news/environment/climate-change",
+)
+
+ARTICLE_SENTENCES = (
+    "Gold prices rose sharply as investors sought safety amid global uncertainty.",
+    "The rupee weakened against the dollar after a fresh surge in crude oil imports.",
+    "Economists expect the central bank to hold interest rates at its next meeting.",
+    "Retail inflation eased for a third straight month on softer food prices.",
+    "Exporters warned that slowing demand in Europe could weigh on growth this year.",
+    "Government data showed GDP expanding faster than most analysts had forecast.",
+)
+
+# Weighted mix of routes a reader session hits
+ROUTE_WEIGHTS = (
+    ("/", 1),
+    ("/fetch-hindu-news?mode=headlines", 3),
+    ("/fetch-mint-news?mode=headlines", 3),
+    ("/fetch-financial-news?mode=headlines", 3),
+    ("/fetch-news18-news?mode=headlines", 3),
+    ("/fetch-hindu-news", 1),
+    ("/fetch-mint-news", 1),
+    ("/fetch-financial-news", 1),
+    ("/fetch-news18-news", 1),
+    ("/summary", 6),
+    ("/search", 2),
+)
+SEARCH_TERMS = ("gold", "rupee", "gdp", "inflation", "crude oil", "interest rates")
+
+
+def fixture_listing(host, path):
+    """Synthetic section page in the markup each scraper expects, or None if not a listing"""
+    if 'thehindubusinessline' in host and path == '/economy/':
+        return ''.join(f'<a class="element" href="/economy/story-{i}.ece">Hindu economy story {i}</a>' for i in range(10))
+    if 'livemint' in host and path == '/latest-news':
+        return ''.join(
+            f'<div class="listingNew"><h2><a href="/news/story-{i}.html">Mint story {i}</a></h2>'
+            f'<time datetime="2025-01-15T08:00:00Z"></time></div>'
+            for i in range(10)
+        )
+    if 'financialexpress' in host and path == '/about/economy/':
+        return ''.join(
+            f'<article id="post-{i}"><div class="entry-wrapper"><div class="entry-title">'
+            f'<a href="https://www.financialexpress.com/economy/story-{i}/">FE economy story {i}</a></div>'
+            f'<div class="entry-meta"><time class="entry-date published">January 15, 2025</time></div></div></article>'
+            for i in range(10)
+        )
+    if 'news18' in host and path in NEWS18_CATEGORY_PATHS:
+        return ''.join(
+            f'<div class="article"><a href="{path}/story-{i}.html"><h3>News18 story {i}</h3></a></div>'
+            for i in range(10)
+        )
+    return None
+
+
+def fixture_article(path):
+    """Synthetic article page that satisfies every scraper's content selectors"""
+    rng = random.Random(path)
+    paragraphs = ''.join(
+        '<p>' + ' '.join(rng.sample(ARTICLE_SENTENCES, 4)) + '</p>'
+        for _ in range(8)
+    )
+    return (
+        f'<h1>Story at {path}</h1><time datetime="2025-01-15T08:00:00Z">15 Jan 2025</time>'
+        '<div class="article-section"><div class="post-content wp-block-post-content mb-4">'
+        f'<div class="pcl-container"><div class="article-content">{paragraphs}</div></div></div></div>'
+    )
+
+
+class FixtureServer:
+    """Serves listing and article fixtures for every upstream host, with configurable latency"""
+
+    def __init__(self, latency=0.1, jitter=0.05, port=0):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(max(0.0, random.gauss(server.latency, server.jitter)))
+                host = self.headers.get('X-Upstream-Host', '')
+                path = self.path.split('?', 1)[0]
+                listing = fixture_listing(host, path)
+                body = f"<html><body>{listing if listing is not None else fixture_article(path)}</body></html>".encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.latency = latency
+        self.jitter = jitter
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+
+
+def start_app(config, fixture_url, port, db_path, digest_ttl, log_path):
+    worker_class, workers, threads = config.split(':')
+    env = dict(
+        os.environ,
+        UPSTREAM_OVERRIDE=fixture_url,
+        NEWSAPP_DB=db_path,
+        DIGEST_TTL=str(digest_ttl),
+        RENDER_FALLBACK='0',
+        BACKFILL_ARTICLES='0',
+    )
+    command = [
+        sys.executable, '-m', 'gunicorn', 'app:app',
+        '--bind', f'127.0.0.1:{port}',
+        '--worker-class', worker_class,
+        '--workers', workers,
+        '--timeout', '60',
+    ]
+    if int(threads) > 0:
+        command += ['--threads', threads]
+    # gunicorn logs to a file: an unread pipe would fill up and stall the server under test
+    with open(log_path, 'wb') as log:
+        process = subprocess.Popen(command, cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=log)
+
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(120):
+        if process.poll() is not None:
+            with open(log_path, 'rb') as log:
+                raise RuntimeError(log.read().decode(errors='replace')[-2000:])
+        try:
+            requests.get(base_url + '/', timeout=1)
+            return process, base_url
+        except requests.RequestException:
+            time.sleep(0.5)
+    process.kill()
+    raise RuntimeError("gunicorn did not start within 60s")
+
+
+def stop_app(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def route_url(base_url, route, fixture_article_urls):
+    if route == '/summary':
+        return base_url + '/summary', {'url': random.choice(fixture_article_urls)}
+    if route == '/search':
+        return base_url + '/search', {'q': random.choice(SEARCH_TERMS)}
+    return base_url + route, None
+
+
+def drive(base_url, users, duration, think_time):
+    """Run concurrent reader sessions for `duration` seconds; returns {route: [(latency, ok)]}"""
+    article_urls = [f"https://www.livemint.com/news/story-{i}.html" for i in range(10)]
+    article_urls += [f"https://www.thehindubusinessline.com/economy/story-{i}.ece" for i in range(10)]
+    routes = [route for route, _ in ROUTE_WEIGHTS]
+    weights = [weight for _, weight in ROUTE_WEIGHTS]
+    results = defaultdict(list)
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def user():
+        session = requests.Session()
+        while time.monotonic() < stop_at:
+            route = random.choices(routes, weights)[0]
+            url, params = route_url(base_url, route, article_urls)
+            started = time.monotonic()
+            try:
+                ok = session.get(url, params=params, timeout=60).status_code < 500
+            except requests.RequestException:
+                ok = False
+            with lock:
+                results[route].append((time.monotonic() - started, ok))
+            if think_time:
+                time.sleep(random.expovariate(1 / think_time))
+
+    threads = [threading.Thread(target=user) for _ in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(samples, duration):
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, ok in samples if not ok)
+    return {
+        'requests': len(samples),
+        'rps': round(len(samples) / duration, 2),
+        'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+    }
+
+
+def print_report(config, report):
+    print(f"\n=== {config} ===")
+    print(f"{'route':<40}{'reqs':>7}{'rps':>9}{'err%':>7}{'p50ms':>9}{'p95ms':>9}{'p99ms':>9}")
+    for route, stats in report.items():
+        print(f"{route:<40}{stats['requests']:>7}{stats['rps']:>9}{stats['error_rate'] * 100:>7.1f}"
+              f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}")
+
+
+def run_config(config, args, fixture):
+    with tempfile.TemporaryDirectory() as tmp:
+        process, base_url = start_app(
+            config, fixture.url, args.port, os.path.join(tmp, 'newsapp.db'), args.digest_ttl,
+            os.path.join(tmp, 'gunicorn.log')
+        )
+        try:
+            results = drive(base_url, args.users, args.duration, args.think_time)
+        finally:
+            stop_app(process)
+
+    report = {'ALL': summarize([s for samples in results.values() for s in samples], args.duration)}
+    for route in sorted(results):
+        report[route] = summarize(results[route], args.duration)
+    return report
+
+
+def check_slos(report, args):
+    overall = report['ALL']
+    failures = []
+    if args.slo_p95 is not None and overall['p95_ms'] > args.slo_p95:
+        failures.append(f"p95 {overall['p95_ms']}ms > {args.slo_p95}ms")
+    if args.slo_p99 is not None and overall['p99_ms'] > args.slo_p99:
+        failures.append(f"p99 {overall['p99_ms']}ms > {args.slo_p99}ms")
+    if args.slo_error_rate is not None and overall['error_rate'] > args.slo_error_rate:
+        failures.append(f"error rate {overall['error_rate']} > {args.slo_error_rate}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the app under gunicorn against local fixtures")
+    parser.add_argument('--configs', nargs='+', default=['sync:4:1', 'gthread:4:8'],
+                        help="gunicorn configs as worker_class:workers:threads")
+    parser.add_argument('--users', type=int, default=20, help="Concurrent simulated readers")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds of traffic per config")
+    parser.add_argument('--think-time', type=float, default=0.5, help="Mean pause between a reader's requests")
+    parser.add_argument('--latency', type=float, default=0.2, help="Mean upstream latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.05, help="Std deviation of upstream latency")
+    parser.add_argument('--digest-ttl', type=int, default=900, help="DIGEST_TTL for the app (0 scrapes on every request)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--slo-p95', type=float, help="Overall p95 latency SLO in ms")
+    parser.add_argument('--slo-p99', type=float, help="Overall p99 latency SLO in ms")
+    parser.add_argument('--slo-error-rate', type=float, help="Maximum overall error rate (0-1)")
+    parser.add_argument('--json', help="Write all reports to this file")
+    args = parser.parse_args()
+
+    fixture = FixtureServer(latency=args.latency, jitter=args.jitter).start()
+    reports = {}
+    violations = {}
+    try:
+        for config in args.configs:
+            try:
+                reports[config] = run_config(config, args, fixture)
+            except Exception as e:
+                print(f"\n=== {config} ===\nFailed to run: {str(e)}")
+                lines = [line.strip() for line in str(e).splitlines() if line.strip()]
+                reason = [line for line in lines if 'Error' in line] or lines or [repr(e)]
+                violations[config] = [f"did not run: {reason[-1]}"]
+                continue
+            print_report(config, reports[config])
+            failures = check_slos(reports[config], args)
+            if failures:
+                violations[config] = failures
+    finally:
+        fixture.stop()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'reports': reports, 'slo_violations': violations}, f, indent=2)
+
+    for config, failures in violations.items():
+        print(f"SLO violated for {config}: {'; '.join(failures)}")
+    sys.exit(1 if violations else 0)
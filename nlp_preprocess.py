@@ -0,0 +1,123 @@
+import functools
+import re
+
+import nltk
+from sumy.models.dom import ObjectDocumentModel, Paragraph, Sentence
+from sumy.nlp.stemmers import Stemmer
+from sumy.nlp.tokenizers import Tokenizer
+from sumy.utils import get_stop_words
+
+from cache_manager import cache_manager
+
+LANGUAGE = "english"
+
+STOP_WORDS = frozenset(get_stop_words(LANGUAGE))
+
+# What sumy's tokenizer counts as a word: letters, optionally joined by apostrophes or hyphens
+WORD_PATTERN = re.compile(r"^[^\W\d_](?:[^\W\d_]|['-])*$", re.UNICODE)
+
+_stemmer = Stemmer(LANGUAGE)
+
+# Stems are memoized, so a word seen in any earlier article is not stemmed again
+_stems = cache_manager.register('stems')
+
+
+def stem(word):
+    result = _stems.get(word)
+    if result is None:
+        result = _stemmer(word)
+        _stems.set(word, result)
+    return result
+
+
+@functools.lru_cache(maxsize=None)
+def sentence_tokenizer():
+    """sumy's Punkt-backed tokenizer, loaded once per process instead of once per summary"""
+    return Tokenizer(LANGUAGE)
+
+
+class PreprocessedText:
+    """
+    Sentences, words, stems and word count of one article, computed once and shared by
+    every summarizer and content filter. It also acts as the word tokenizer for the sumy
+    document it builds, so sumy never re-tokenizes the text.
+    """
+
+    def __init__(self, text):
+        self.text = re.sub(r'\s+', ' ', text or '').strip()
+        self.sentences = sentence_tokenizer().to_sentences(self.text) if self.text else ()
+        # Sentences are already split, so word tokenization skips NLTK's own sentence pass
+        self.words = tuple(
+            self._tokenize(sentence) for sentence in self.sentences
+        )
+        self.word_count = sum(len(words) for words in self.words)
+        self._words_by_sentence = dict(zip(self.sentences, self.words))
+
+    @staticmethod
+    def _tokenize(sentence):
+        return tuple(word for word in nltk.word_tokenize(sentence, preserve_line=True) if WORD_PATTERN.match(word))
+
+    @functools.cached_property
+    def vocabulary(self):
+        """Distinct lowercased words of the text"""
+        return frozenset(word.lower() for words in self.words for word in words)
+
+    @functools.cached_property
+    def stems(self):
+        """Stem of every word in the vocabulary, looked up in the shared memo once"""
+        return {word: stem(word) for word in self.vocabulary}
+
+    def stem_of(self, word):
+        """Stemmer for sumy summarizers over this text; expects a lowercased word"""
+        result = self.stems.get(word)
+        return result if result is not None else stem(word)
+
+    def to_words(self, sentence):
+        words = self._words_by_sentence.get(sentence)
+        if words is None:
+            words = self._tokenize(sentence)
+        return words
+
+    def document(self):
+        """The text as a sumy document whose sentences reuse the words computed here"""
+        return ObjectDocumentModel([Paragraph([Sentence(sentence, self) for sentence in self.sentences])])
+
+
+def preprocessed_size(value):
+    """Approximate bytes held by a cached text, its tokens and its stem map once built"""
+    if isinstance(value, PreprocessedText):
+        return 2 * len(value.text) + 250 * value.word_count + 500
+    return len(value) + 50
+
+
+# Recently preprocessed articles, sized by text length so long articles go first under pressure
+_preprocessed = cache_manager.register('preprocessed_text', ttl=3600, sizeof=preprocessed_size)
+
+
+def preprocess(text):
+    """Preprocess an article's text, reusing the result if the same text was seen recently"""
+    result = _preprocessed.get(text)
+    if result is None:
+        result = PreprocessedText(text)
+        _preprocessed.set(text, result)
+    return result
+
+
+def preprocess_batch(texts):
+    """
+    Preprocess a digest's articles together. Repeated texts are processed once, and the
+    stems of the batch's combined vocabulary are resolved in a single pass, so a word
+    shared by several articles goes through the shared stem memo once per batch.
+    """
+    unique = {}
+    for text in texts:
+        if text not in unique:
+            unique[text] = preprocess(text)
+
+    # Articles already stemmed (e.g. served from the cache) keep their stem maps
+    pending = [result for result in unique.values() if 'stems' not in result.__dict__]
+    batch_stems = {word: stem(word) for word in frozenset().union(*(result.vocabulary for result in pending))}
+    for result in pending:
+        result.stems = {word: batch_stems[word] for word in result.vocabulary}
+
+    return [unique[text] for text in texts]
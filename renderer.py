@@ -0,0 +1,169 @@
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, TimeoutError, wait
+
+from deadline import current_deadline
+from http_client import HEADERS
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None
+
+# Headless rendering is only a fallback for listings whose links are built client-side
+RENDER_FALLBACK = os.getenv("RENDER_FALLBACK", "1") == "1"
+RENDER_POOL_SIZE = int(os.getenv("RENDER_POOL_SIZE", 2))
+RENDER_TIMEOUT = float(os.getenv("RENDER_TIMEOUT", 15))
+
+# Extra time a caller waits for a busy pool to reach its job before giving up on it
+RENDER_QUEUE_WAIT = 5
+
+# Resources that never contribute links to a listing page
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+AD_HOST_MARKERS = (
+    'doubleclick.net', 'googlesyndication.com', 'googleadservices.com', 'adservice.google',
+    'googletagmanager.com', 'google-analytics.com', 'amazon-adsystem.com', 'taboola.com',
+    'outbrain.com', 'scorecardresearch.com', 'facebook.net', 'criteo.', 'moatads.com'
+)
+
+
+def _block_heavy_requests(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(marker in request.url for marker in AD_HOST_MARKERS):
+        route.abort()
+    else:
+        route.continue_()
+
+
+class RenderPool:
+    """
+    A warm pool of headless Chromium pages. Playwright's sync API is bound to the thread
+    that created it, so each pool slot is a thread owning one browser context and page,
+    reused across renders. Browsers are launched in the background on first use; a
+    render waits for one only as long as its own timeout allows.
+    """
+
+    def __init__(self, size=RENDER_POOL_SIZE):
+        self.size = size
+        self.broken = sync_playwright is None or not RENDER_FALLBACK
+        self._jobs = queue.Queue()
+        self._launches = []
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._launches:
+                return
+            for _ in range(self.size):
+                launched = Future()
+                threading.Thread(target=self._worker, args=(launched,), daemon=True).start()
+                self._launches.append(launched)
+
+    def _wait_ready(self, timeout):
+        """True once any browser has launched; False if none has within timeout"""
+        pending = set(self._launches)
+        give_up_at = time.monotonic() + timeout
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, give_up_at - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                return False
+            for launched in done:
+                if launched.exception() is None:
+                    return True
+                print(f"Error starting headless browser: {str(launched.exception())}")
+        # Every launch failed: stop trying for the rest of this process
+        self.broken = True
+        return False
+
+    def _worker(self, launched):
+        try:
+            playwright = sync_playwright().start()
+            browser = playwright.chromium.launch(headless=True)
+            context = browser.new_context(user_agent=HEADERS['User-Agent'])
+            context.route('**/*', _block_heavy_requests)
+            page = context.new_page()
+        except Exception as e:
+            launched.set_exception(e)
+            return
+        launched.set_result(True)
+
+        while True:
+            url, timeout, future = self._jobs.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                page.goto(url, wait_until='domcontentloaded', timeout=timeout * 1000)
+                try:
+                    # Give client-side listings a moment to populate, without waiting on trackers
+                    page.wait_for_load_state('networkidle', timeout=min(timeout, 3) * 1000)
+                except Exception:
+                    pass
+                future.set_result(page.content())
+            except Exception as e:
+                future.set_exception(e)
+                # A page left mid-navigation is replaced so the next render starts clean
+                try:
+                    page.close()
+                    page = context.new_page()
+                except Exception:
+                    pass
+
+    def render(self, url, timeout=RENDER_TIMEOUT):
+        """Return the rendered HTML of url, or raise if rendering is unavailable or fails"""
+        if self.broken:
+            raise RuntimeError("Headless rendering is not available")
+        started = time.monotonic()
+        self._start()
+        if not self._wait_ready(timeout):
+            raise RuntimeError("No headless browser ready in time")
+        # Launch time comes out of the same timeout, so the first render is not twice as long
+        timeout -= time.monotonic() - started
+        if timeout <= 1:
+            raise RuntimeError("No time left to render after launching the browser")
+
+        future = Future()
+        self._jobs.put((url, timeout, future))
+        try:
+            return future.result(timeout=timeout + RENDER_QUEUE_WAIT)
+        except TimeoutError:
+            # Still queued: make sure no browser slot picks it up after the caller gave up
+            future.cancel()
+            raise
+
+
+render_pool = RenderPool()
+
+
+# Function to render a page in the headless pool, returning None when it cannot be done
+def render_page(url):
+    if render_pool.broken:
+        return None
+
+    timeout = RENDER_TIMEOUT
+    deadline = current_deadline()
+    if deadline is not None:
+        timeout = min(timeout, deadline.budget('fetch'))
+        if timeout <= 1:
+            return None
+
+    try:
+        print(f"Rendering in headless browser: {url}")
+        return render_pool.render(url, timeout=timeout)
+    except Exception as e:
+        print(f"Error rendering {url}: {str(e)}")
+        return None
+
+
+if __name__ == "__main__":
+    # Render a page (or a local fixture via file:///path/to/page.html) and report its links
+    from bs4 import BeautifulSoup
+
+    html = render_page(sys.argv[1])
+    if html is None:
+        print("Rendering failed")
+    else:
+        links = BeautifulSoup(html, 'html.parser').find_all('a', href=True)
+        print(f"Rendered {len(html)} bytes with {len(links)} links")
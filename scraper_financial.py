@@ -1,21 +1,20 @@
 
 from bs4 import BeautifulSoup
-import requests
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
+import http_client
+from deadline import out_of_time
 from sumy.summarizers.lsa import LsaSummarizer
-from sumy.utils import get_stop_words
+from nlp_preprocess import preprocess, STOP_WORDS
 
 # Function to summarize a long article using Sumy
 def summarize_article_sumy(content, max_sentences=3):
     try:
-        # Create a PlaintextParser object from the article content
-        parser = PlaintextParser.from_string(content, Tokenizer("english"))
+        # Reuse the shared preprocessing of the article content
+        document = preprocess(content).document()
         summarizer = LsaSummarizer()
-        summarizer.stop_words = get_stop_words("english")
+        summarizer.stop_words = STOP_WORDS
 
         # Generate a summary with the specified number of sentences
-        summary = summarizer(parser.document, max_sentences)
+        summary = summarizer(document, max_sentences)
         return " ".join(str(sentence) for sentence in summary) or "Summary not available."
     except Exception as e:
         print(f"Error summarizing article: {e}")
@@ -27,7 +26,7 @@ def fetch_financial_express_headlines(url, limit=5):
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.content, 'html.parser')
@@ -66,8 +65,10 @@ def fetch_article_content(url):
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
+        if out_of_time('parse'):
+            return 'Error: no time left to parse article content'
 
         soup = BeautifulSoup(response.content, 'html.parser')
 
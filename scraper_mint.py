@@ -1,10 +1,10 @@
 
-import requests
+import http_client
 from bs4 import BeautifulSoup
-from nltk.tokenize import sent_tokenize, word_tokenize
 from nltk.corpus import stopwords
 from collections import Counter
 import nltk
+from nlp_preprocess import preprocess
 
 # Ensure you have downloaded the necessary NLTK data files
 nltk.download('punkt')
@@ -19,7 +19,7 @@ class MintScraper:
 
     def _scrape_generic(self, url, container_tag, container_class, title_tag, link_tag, prefix=""):
         try:
-            response = requests.get(url, headers=self.headers)
+            response = http_client.get(url, headers=self.headers)
             response.raise_for_status()  # Raise an HTTPError for bad responses (4xx and 5xx)
             soup = BeautifulSoup(response.content, 'html.parser')
 
@@ -42,7 +42,7 @@ class MintScraper:
 
     def fetch_article_content(self, url):
         try:
-            response = requests.get(url, headers=self.headers)
+            response = http_client.get(url, headers=self.headers)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, 'html.parser')
 
@@ -54,21 +54,21 @@ class MintScraper:
             return "Content not available"
 
     def summarize_article(self, content, sentence_count=3):
-        # Tokenize the content into sentences
-        sentences = sent_tokenize(content)
+        # Sentences and words come from the shared preprocessing stage
+        document = preprocess(content)
 
-        # Tokenize the content into words and remove stopwords
+        # Remove stopwords from the lowercased words
         stop_words = set(stopwords.words("english"))
-        words = word_tokenize(content.lower())
-        words = [word for word in words if word.isalnum() and word not in stop_words]
+        sentence_words = [[word.lower() for word in words] for words in document.words]
+        words = [word for words in sentence_words for word in words if word.isalnum() and word not in stop_words]
 
         # Count the frequency of each word
         word_freq = Counter(words)
 
         # Score each sentence based on the frequency of the words it contains
         sentence_scores = {}
-        for sentence in sentences:
-            for word in word_tokenize(sentence.lower()):
+        for sentence, words in zip(document.sentences, sentence_words):
+            for word in words:
                 if word in word_freq:
                     if sentence not in sentence_scores:
                         sentence_scores[sentence] = word_freq[word]
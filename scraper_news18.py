@@ -1,120 +1,258 @@
 
-import requests
+import http_client
+from renderer import render_page
 from bs4 import BeautifulSoup
 import pandas as pd
 from datetime import datetime
 import time
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
 from sumy.summarizers.lsa import LsaSummarizer
-from sumy.nlp.stemmers import Stemmer
-from sumy.utils import get_stop_words
+from nlp_preprocess import preprocess, STOP_WORDS
+from cache_manager import cache_manager
+from deadline import out_of_time
 import re
 
+# URL keywords that mark an article as relevant to each category
+CATEGORY_KEYWORDS = {
+    "Economy": ['economy', 'gdp', 'inflation', 'economic', 'finance', 'rbi', 'trade'],
+    "Global Economy": ['global', 'world', 'international', 'trade', 'forex', 'foreign'],
+    "Commodities": ['commodity', 'commodities', 'crude', 'oil', 'metal', 'palm-oil', 'soybean'],
+    "Gold Prices": ['gold-price', 'gold-rates', 'silver-price', 'bullion'],
+    "Climate Change": ['climate', 'environment', 'carbon', 'emission', 'sustainable']
+}
+
+# Category listing pages on news18.com
+CATEGORY_PATHS = {
+    "Economy": "/business/economy",
+    "Global Economy": "/business/economy/global-economy",
+    "Commodities": "/business/markets/commodities",
+    "Gold Prices": "/business/markets/commodity/gold-price",
+    "Climate Change": "/news/environment/climate-change"
+}
+
+
+def keyword_trie_pattern(keywords):
+    """Build a regex alternation factored by common prefixes, preferring the longest keyword"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A keyword ending here makes the longer continuations optional (tried first, greedily)
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class CategoryMatcher:
+    """Classifies a URL into every matching category with one precompiled regex scan"""
+
+    def __init__(self, categories):
+        keyword_categories = {}
+        for category, path in categories.items():
+            # Include the category URL path as a relevant keyword
+            for keyword in CATEGORY_KEYWORDS.get(category, []) + [path.lower().strip('/')]:
+                keyword_categories.setdefault(keyword, set()).add(category)
+
+        # The scan reports only the longest keyword starting at each position, so a
+        # keyword also carries the categories of every shorter keyword it contains
+        self.keyword_categories = {
+            keyword: frozenset().union(*(cats for other, cats in keyword_categories.items() if other in keyword))
+            for keyword in keyword_categories
+        }
+
+        # Zero-width lookahead so overlapping keywords are all visited
+        self.pattern = re.compile(f'(?=({keyword_trie_pattern(keyword_categories)}))')
+
+    def classify(self, url):
+        """Return the set of categories whose keywords appear in the URL"""
+        if not url:
+            return frozenset()
+        matched = set()
+        for match in self.pattern.finditer(url.lower()):
+            matched |= self.keyword_categories[match.group(1)]
+        return matched
+
+
+# Compiled once per process and shared by every scraper instance
+category_matcher = CategoryMatcher(CATEGORY_PATHS)
+
+# Whether an article URL has enough text to summarize, shared by every scraper instance
+content_checks = cache_manager.register('news18_content_checks', ttl=6 * 3600)
+
+
 class News18Scraper:
     def __init__(self):
         self.base_url = "https://www.news18.com"
-        self.categories = {
-            "Economy": "/business/economy",
-            "Global Economy": "/business/economy/global-economy",
-            "Commodities": "/business/markets/commodities",
-            "Gold Prices": "/business/markets/commodity/gold-price",
-            "Climate Change": "/news/environment/climate-change"
-        }
+        self.categories = CATEGORY_PATHS
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.min_content_words = 100
+        self.matcher = category_matcher
+        # Content-length verdicts per URL, so links shared by categories are fetched once
+        self._content_checks = content_checks
 
     def is_relevant_article(self, url, category):
         """Check if article URL is relevant to the category"""
-        if not url:
-            return False
-            
-        category_keywords = {
-            "Economy": ['economy', 'gdp', 'inflation', 'economic', 'finance', 'rbi', 'trade'],
-            "Global Economy": ['global', 'world', 'international', 'trade', 'forex', 'foreign'],
-            "Commodities": ['commodity', 'commodities', 'crude', 'oil', 'metal', 'palm-oil', 'soybean'],
-            "Gold Prices": ['gold-price', 'gold-rates', 'silver-price', 'bullion'],
-            "Climate Change": ['climate', 'environment', 'carbon', 'emission', 'sustainable']
-        }
-        
-        # Include the category URL path as a relevant keyword
-        category_path = self.categories[category].lower()
-        keywords = category_keywords.get(category, []) + [category_path.strip('/')]
-        
-        return any(keyword in url.lower() for keyword in keywords)
+        return category in self.matcher.classify(url)
 
     def get_article_links(self, category_url, category_name, limit=5):
         """Extract limited article links from a category page"""
+        found = {category_name: []}
+        self.collect_article_links(category_url, category_name, found, limit)
+        return found[category_name]
+
+    def get_links_by_category(self, limit=5):
+        """Scan each category page once, routing every link to all categories it matches"""
+        found = {category: [] for category in self.categories}
+        for category_name, category_path in self.categories.items():
+            if len(found[category_name]) >= limit:
+                print(f"Category already filled from other pages: {category_name}")
+                continue
+            self.collect_article_links(self.base_url + category_path, category_name, found, limit)
+        return found
+
+    def collect_article_links(self, category_url, category_name, found, limit=5):
+        """Add valid links from a category page to every category in `found` they match"""
         try:
-            response = requests.get(category_url, headers=self.headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.get_listing_soup(category_url, limit)
             
-            article_links = []
             processed_count = 0
             
-            # Method 1: Find articles by class
-            articles = soup.find_all(['div', 'article'], class_=lambda x: x and any(c in str(x).lower() for c in ['article', 'news-list', 'news_item']))
-            
-            # Method 2: Find all links
-            if not articles:
-                articles = soup.find_all('a', href=True)
-            
-            for article in articles:
-                if len(article_links) >= limit:
+            for url in self.candidate_urls(soup):
+                if len(found[category_name]) >= limit:
                     break
                 
-                # Extract URL based on element type
-                url = None
-                if article.name == 'a':
-                    url = article.get('href', '')
-                else:
-                    link = article.find('a', href=True)
-                    if link:
-                        url = link.get('href', '')
-                
-                if not url:
-                    continue
-                    
-                # Clean and validate URL
-                url = url.strip()
-                if url.startswith('//'):
-                    url = 'https:' + url
-                elif url.startswith('/'):
-                    url = self.base_url + url
-                elif not (url.startswith('http://') or url.startswith('https://')):
-                    continue
-                
-                # Verify it's a news18 URL
-                if 'news18.com' not in url:
-                    continue
-                
-                # Check relevance and content
-                if self.is_relevant_article(url, category_name):
+                # Route to every category that is relevant and still has room
+                targets = [c for c in self.matcher.classify(url) if c in found and len(found[c]) < limit and url not in found[c]]
+                if targets:
                     print(f"Checking content for: {url}")
                     if self.has_sufficient_content(url):
-                        if url not in article_links:
-                            article_links.append(url)
-                            print(f"Added valid article: {url}")
+                        for target in targets:
+                            found[target].append(url)
+                        print(f"Added valid article: {url} -> {', '.join(targets)}")
                     processed_count += 1
                 
                 if processed_count > limit * 4:
                     break
             
-            print(f"Found {len(article_links)} valid articles with sufficient content")
-            return article_links
+            print(f"Found {len(found[category_name])} valid articles with sufficient content")
+            return found
             
         except Exception as e:
             print(f"Error getting article links: {str(e)}")
-            return []
+            return found
+
+    def discover_article_links(self, category_url, limit=20):
+        """List relevant article links on a category page without fetching the articles"""
+        soup = self.get_listing_soup(category_url, limit)
+        return self.relevant_urls(soup, limit)
+
+    def relevant_urls(self, soup, limit):
+        """First `limit` distinct candidate URLs that match any category"""
+        links = []
+        for url in self.candidate_urls(soup):
+            if url not in links and self.matcher.classify(url):
+                links.append(url)
+            if len(links) >= limit:
+                break
+        return links
+
+    def get_listing_soup(self, category_url, min_links):
+        """Parse a category page, rendering it headlessly only if too few links are in the static HTML"""
+        response = http_client.get(category_url, headers=self.headers)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.text, 'html.parser')
+
+        static_count = len(self.relevant_urls(soup, min_links))
+        if static_count < min_links:
+            html = render_page(category_url)
+            if html:
+                rendered = BeautifulSoup(html, 'html.parser')
+                if len(self.relevant_urls(rendered, min_links)) > static_count:
+                    return rendered
+        return soup
+
+    def candidate_urls(self, soup):
+        """Yield absolute news18.com URLs of the article links on a category page"""
+        for url, _ in self.candidate_links(soup):
+            yield url
+
+    def candidate_links(self, soup):
+        """Yield (absolute news18.com URL, link title) for the article links on a category page"""
+        # Method 1: Find articles by class
+        articles = soup.find_all(['div', 'article'], class_=lambda x: x and any(c in str(x).lower() for c in ['article', 'news-list', 'news_item']))
+        
+        # Method 2: Find all links
+        if not articles:
+            articles = soup.find_all('a', href=True)
+        
+        for article in articles:
+            # Extract URL based on element type
+            url = None
+            link = article if article.name == 'a' else article.find('a', href=True)
+            if link:
+                url = link.get('href', '')
+            
+            if not url:
+                continue
+                
+            # Clean and validate URL
+            url = url.strip()
+            if url.startswith('//'):
+                url = 'https:' + url
+            elif url.startswith('/'):
+                url = self.base_url + url
+            elif not (url.startswith('http://') or url.startswith('https://')):
+                continue
+            
+            # Verify it's a news18 URL
+            if 'news18.com' not in url:
+                continue
+            
+            # Prefer the card heading, then the link text, then its title attribute
+            heading = article.find(['h1', 'h2', 'h3', 'h4']) if article.name != 'a' else None
+            title = (heading or link).get_text(' ', strip=True) or link.get('title', '').strip()
+            
+            yield url, title
+
+    def discover_article_headlines(self, category_url, limit=5):
+        """List relevant articles on a category page, using link titles as headlines"""
+        soup = self.get_listing_soup(category_url, limit)
+        headlines = []
+        seen = set()
+        for url, title in self.candidate_links(soup):
+            if url in seen or not title or not self.matcher.classify(url):
+                continue
+            seen.add(url)
+            headlines.append({'headline': title, 'url': url})
+            if len(headlines) >= limit:
+                break
+        return headlines
 
     def has_sufficient_content(self, url):
         """Check if article has sufficient content for summarization"""
+        verdict = self._content_checks.get(url)
+        if verdict is None:
+            verdict = self._check_content(url)
+            # Failed fetches are retried on the next check rather than remembered
+            if verdict is not None:
+                self._content_checks.set(url, verdict)
+        return bool(verdict)
+
+    def _check_content(self, url):
         try:
-            response = requests.get(url, headers=self.headers)
+            response = http_client.get(url, headers=self.headers)
             response.raise_for_status()
+            if out_of_time('parse'):
+                return None
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Extract content using multiple methods
@@ -152,20 +290,27 @@ class News18Scraper:
                             content_text.append(text)
             
             content = ' '.join(content_text)
-            word_count = len(content.split())
+            word_count = preprocess(content).word_count
             
             print(f"Found {word_count} words in article")
             return word_count >= self.min_content_words
             
         except Exception as e:
             print(f"Error checking content length for {url}: {str(e)}")
-            return False
+            return None
 
-    def extract_article_data(self, article_url):
-        """Extract data from a single article"""
+    def extract_article_data(self, article_url, raise_errors=False, summarize=True):
+        """
+        Extract data from a single article. Returns None for pages that are not usable
+        articles; fetch errors also return None unless raise_errors is set. With
+        summarize=False the summary is left to the caller (e.g. for a whole digest at once).
+        """
         try:
-            response = requests.get(article_url, headers=self.headers)
+            response = http_client.get(article_url, headers=self.headers)
             response.raise_for_status()
+            if out_of_time('parse'):
+                print(f"Skipping {article_url}: no time left to parse it")
+                return None
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Extract headline
@@ -234,35 +379,38 @@ class News18Scraper:
             
             content = ' '.join(content_text)
             
-            if not content or len(content.split()) < self.min_content_words:
+            if not content or preprocess(content).word_count < self.min_content_words:
                 return None
             
-            summary = self.generate_summary(content)
+            # Out of time: the summary is left empty and computed later through /summary
+            summary = self.generate_summary(content) if summarize and not out_of_time('summarize') else None
             
             return {
                 'headline': headline,
                 'link': article_url,
                 'publish_date': publish_date,
                 'publish_time': publish_time,
-                'summary': summary
+                'summary': summary,
+                'content': content
             }
             
         except Exception as e:
             print(f"Error extracting data from {article_url}: {str(e)}")
+            if raise_errors:
+                raise
             return None
 
     def generate_summary(self, text, sentences_count=3):
         """Generate summary using Sumy"""
         try:
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            parser = PlaintextParser.from_string(text, Tokenizer("english"))
-            stemmer = Stemmer("english")
-            summarizer = LsaSummarizer(stemmer)
-            summarizer.stop_words = get_stop_words("english")
+            # Reuses the preprocessing done by the content-length check, including its stems
+            preprocessed = preprocess(text)
+            document = preprocessed.document()
+            summarizer = LsaSummarizer(preprocessed.stem_of)
+            summarizer.stop_words = STOP_WORDS
             
             summary = []
-            for sentence in summarizer(parser.document, sentences_count):
+            for sentence in summarizer(document, sentences_count):
                 summary.append(str(sentence))
             
             return ' '.join(summary) if summary else "Unable to generate summary"
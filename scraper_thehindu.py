@@ -1,10 +1,8 @@
 
 from bs4 import BeautifulSoup
-import requests
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
+import http_client
 from sumy.summarizers.lsa import LsaSummarizer
-from sumy.utils import get_stop_words
+from nlp_preprocess import preprocess, STOP_WORDS
 import re
 
 # Function to clean article content
@@ -22,10 +20,9 @@ def summarize_article_sumy(content, max_sentences=3):
     """
     Summarizes the content using the LSA (Latent Semantic Analysis) summarizer from Sumy.
     """
-    parser = PlaintextParser.from_string(content, Tokenizer("english"))
     summarizer = LsaSummarizer()
-    summarizer.stop_words = get_stop_words("english")
-    summary = summarizer(parser.document, max_sentences)
+    summarizer.stop_words = STOP_WORDS
+    summary = summarizer(preprocess(content).document(), max_sentences)
     return " ".join(str(sentence) for sentence in summary)
 
 # Function to fetch headlines and links from The Hindu BusinessLine
@@ -35,7 +32,7 @@ def fetch_thehindu_headlines(url, limit=5):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.content, 'html.parser')
@@ -64,7 +61,7 @@ def fetch_article_details(url):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.content, 'html.parser')
@@ -0,0 +1,198 @@
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import date
+
+# Articles and their full-text index live alongside the existing tables in newsapp.db
+DB_PATH = os.getenv("NEWSAPP_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "newsapp.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT UNIQUE NOT NULL,
+    headline TEXT NOT NULL,
+    summary TEXT,
+    body TEXT,
+    source TEXT NOT NULL,
+    published TEXT,
+    digest_date TEXT NOT NULL,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_source_date ON articles(source, digest_date);
+CREATE INDEX IF NOT EXISTS idx_articles_date ON articles(digest_date);
+CREATE INDEX IF NOT EXISTS idx_articles_updated ON articles(updated_at, id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    headline, summary, body,
+    content='articles', content_rowid='id',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, headline, summary, body)
+    VALUES (new.id, new.headline, new.summary, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, headline, summary, body)
+    VALUES ('delete', old.id, old.headline, old.summary, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, headline, summary, body)
+    VALUES ('delete', old.id, old.headline, old.summary, old.body);
+    INSERT INTO articles_fts(rowid, headline, summary, body)
+    VALUES (new.id, new.headline, new.summary, new.body);
+END;
+"""
+
+# BM25 column weights: a hit in the headline counts more than one in the summary or body
+BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+
+class ArticleIndex:
+    """Stores ingested articles in SQLite and searches them through an FTS5 index."""
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._add_updated_at(conn)
+            conn.executescript(SCHEMA)
+
+    @staticmethod
+    def _add_updated_at(conn):
+        # Databases created before updated_at existed get the column, stamped with the current time
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(articles)")]
+        if columns and 'updated_at' not in columns:
+            conn.execute("ALTER TABLE articles ADD COLUMN updated_at REAL")
+            conn.execute("UPDATE articles SET updated_at = ?", (time.time(),))
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add_articles(self, articles):
+        """
+        Inserts or refreshes articles keyed by URL. The FTS index is kept in sync by
+        triggers, so only the rows touched here are (re)indexed.
+        """
+        today = date.today().isoformat()
+        now = time.time()
+        rows = [
+            (
+                article['url'],
+                article['headline'],
+                article.get('summary'),
+                article.get('body'),
+                article['source'],
+                article.get('published'),
+                today,
+                now,
+            )
+            for article in articles
+            if article.get('url') and article.get('headline')
+        ]
+        if not rows:
+            return 0
+
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO articles (url, headline, summary, body, source, published, digest_date, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    headline = excluded.headline,
+                    summary = COALESCE(excluded.summary, articles.summary),
+                    body = COALESCE(excluded.body, articles.body),
+                    published = COALESCE(excluded.published, articles.published),
+                    updated_at = excluded.updated_at
+                WHERE excluded.headline IS NOT articles.headline
+                   OR (excluded.summary IS NOT NULL AND excluded.summary IS NOT articles.summary)
+                   OR (excluded.body IS NOT NULL AND excluded.body IS NOT articles.body)
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def get_summary(self, url):
+        """Stored summary for an article URL, or None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT summary FROM articles WHERE url = ?", (url,)).fetchone()
+        return row['summary'] if row else None
+
+    def update_summary(self, url, summary, body=None):
+        """Attach a summary computed on demand to an already ingested article"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE articles SET summary = ?, body = COALESCE(?, body), updated_at = ? WHERE url = ?",
+                (summary, body, time.time(), url),
+            )
+
+    def search(self, query, source=None, date_from=None, date_to=None, page=1, per_page=20):
+        """
+        Runs a keyword search ranked by BM25. All words in the query must match;
+        results can be narrowed by source name and digest date (YYYY-MM-DD).
+        """
+        terms = re.findall(r'\w+', query.lower())
+        page = max(page, 1)
+        if not terms:
+            return {'query': query, 'total': 0, 'page': page, 'per_page': per_page, 'results': []}
+
+        match = ' '.join(f'"{term}"' for term in terms)
+        conditions = ["articles_fts MATCH ?"]
+        params = [match]
+        if source:
+            conditions.append("a.source = ?")
+            params.append(source)
+        if date_from:
+            conditions.append("a.digest_date >= ?")
+            params.append(date_from)
+        if date_to:
+            conditions.append("a.digest_date <= ?")
+            params.append(date_to)
+        where = " AND ".join(conditions)
+
+        # CROSS JOIN keeps the FTS index as the outer loop; otherwise SQLite may walk the
+        # source/date index and probe the FTS table once per row, which is orders slower
+
+        with self._connect() as conn:
+            total = conn.execute(
+                f"SELECT COUNT(*) FROM articles_fts CROSS JOIN articles a ON a.id = articles_fts.rowid WHERE {where}",
+                params,
+            ).fetchone()[0]
+            rows = conn.execute(
+                f"""
+                SELECT a.headline, a.url, a.source, a.summary, a.published, a.digest_date,
+                       bm25(articles_fts, ?, ?, ?) AS rank
+                FROM articles_fts CROSS JOIN articles a ON a.id = articles_fts.rowid
+                WHERE {where}
+                ORDER BY rank
+                LIMIT ? OFFSET ?
+                """,
+                [*BM25_WEIGHTS, *params, per_page, (page - 1) * per_page],
+            ).fetchall()
+
+        return {
+            'query': query,
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'results': [
+                {
+                    'headline': row['headline'],
+                    'url': row['url'],
+                    'source': row['source'],
+                    'summary': row['summary'],
+                    'published': row['published'],
+                    'digest_date': row['digest_date'],
+                }
+                for row in rows
+            ],
+        }
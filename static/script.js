@@ -5,44 +5,199 @@ function formatDateTime(date, time) {
     return `${date} at ${time}`;
 }
 
-// Fetch articles dynamically from all sources
-async function fetchAllArticles() {
+// Headline-only digests paint first; summaries are loaded per card as it comes into view
+const ENDPOINTS = [
+    "/fetch-hindu-news?mode=headlines",
+    "/fetch-mint-news?mode=headlines",
+    "/fetch-financial-news?mode=headlines",
+    "/fetch-news18-news?mode=headlines",
+];
+
+const CACHE_PREFIX = "digest:";   // localStorage key prefix, one entry per endpoint
+const INITIAL_CARDS = 48;         // cards rendered up front; the rest are appended on scroll
+const CHUNK_SIZE = 24;            // cards appended each time the reader nears the end
+const SUMMARY_CONCURRENCY = 4;    // /summary requests in flight at once
+
+const digests = new Map();        // endpoint -> { etag, articles } or { error }
+const cardNodes = new WeakMap();  // article -> card element, reused across renders
+let items = [];
+let renderedCount = 0;
+let renderScheduled = false;
+
+const summaryQueue = [];          // cards waiting for their summary, in the order they became visible
+let summariesInFlight = 0;
+const summaryObserver = new IntersectionObserver((entries) => {
+    for (const entry of entries) {
+        if (!entry.isIntersecting) continue;
+        summaryObserver.unobserve(entry.target);
+        summaryQueue.push(entry.target);
+    }
+    pumpSummaries();
+}, { rootMargin: "400px" });
+
+// Last digest seen for an endpoint, kept so repeat visits paint before any request
+function loadCachedDigest(endpoint) {
     try {
-        const endpoints = [
-            "/fetch-hindu-news",
-            "/fetch-mint-news",
-            "/fetch-financial-news",
-            "/fetch-news18-news",
-          
-        ];
-
-        const articlesContainer = document.getElementById("articles");
-        articlesContainer.innerHTML = ""; // Clear previous content
-
-        for (const endpoint of endpoints) {
-            const response = await fetch(endpoint);
-            const articles = await response.json();
-
-            if (articles.error) {
-                articlesContainer.innerHTML += `<p>${articles.error}</p>`;
-                continue;
-            }
+        return JSON.parse(localStorage.getItem(CACHE_PREFIX + endpoint));
+    } catch (error) {
+        return null;
+    }
+}
+
+function saveCachedDigest(endpoint, digest) {
+    try {
+        localStorage.setItem(CACHE_PREFIX + endpoint, JSON.stringify(digest));
+    } catch (error) {
+        // Storage full or disabled: the page still works, just without instant repaint
+    }
+}
+
+function createElement(tag, className, text) {
+    const element = document.createElement(tag);
+    if (className) element.className = className;
+    if (text !== undefined) element.textContent = text;
+    return element;
+}
+
+function createCard(article) {
+    const card = createElement("div", "card");
+    card.appendChild(createElement("h3", "", article.headline));
+
+    const summary = createElement("p", article.summary ? "" : "summary-pending", article.summary || "Loading summary…");
+    card.appendChild(summary);
+    if (!article.summary) {
+        card.article = article;
+        summaryObserver.observe(card);
+    }
+
+    const metadata = createElement("div", "metadata");
+    metadata.appendChild(createElement("span", "source", `Source: ${article.source}`));
+    card.appendChild(metadata);
+
+    const link = createElement("a", "", "Read More");
+    link.href = article.url;
+    link.target = "_blank";
+    card.appendChild(link);
+    return card;
+}
+
+function nodeFor(item) {
+    if (item.error) return createElement("p", "", item.error);
+    if (!cardNodes.has(item)) cardNodes.set(item, createCard(item));
+    return cardNodes.get(item);
+}
+
+// Fetch summaries for visible cards, a few at a time
+function pumpSummaries() {
+    while (summariesInFlight < SUMMARY_CONCURRENCY && summaryQueue.length) {
+        loadSummary(summaryQueue.shift());
+    }
+}
+
+async function loadSummary(card) {
+    const article = card.article;
+    const paragraph = card.querySelector("p");
+    summariesInFlight++;
+    try {
+        const response = await fetch(`/summary?url=${encodeURIComponent(article.url)}`);
+        const data = await response.json();
+        article.summary = data.summary || null;
+        paragraph.textContent = data.summary || "Summary unavailable.";
+    } catch (error) {
+        console.error(`Error fetching summary for ${article.url}:`, error);
+        paragraph.textContent = "Summary unavailable.";
+    } finally {
+        paragraph.classList.remove("summary-pending");
+        summariesInFlight--;
+        pumpSummaries();
+    }
+}
+
+// Append the next slice of cards as a single fragment
+function appendCards(count) {
+    const container = document.getElementById("articles");
+    const fragment = document.createDocumentFragment();
+    for (const item of items.slice(renderedCount, renderedCount + count)) {
+        fragment.appendChild(nodeFor(item));
+    }
+    container.appendChild(fragment);
+    renderedCount = Math.min(items.length, renderedCount + count);
+    document.getElementById("articles-sentinel").hidden = renderedCount >= items.length;
+}
+
+// Rebuild the list in endpoint order; existing card elements are moved, not re-parsed
+function render() {
+    renderScheduled = false;
+    items = [];
+    for (const endpoint of ENDPOINTS) {
+        const digest = digests.get(endpoint);
+        if (!digest) continue;
+        if (digest.error) items.push({ error: digest.error });
+        else items.push(...digest.articles);
+    }
+
+    const visible = Math.max(INITIAL_CARDS, renderedCount);
+    document.getElementById("articles").replaceChildren();
+    renderedCount = 0;
+    appendCards(visible);
+}
 
-            articlesContainer.innerHTML += articles.map(article => `
-                <div class="card">
-                    <h3>${article.headline}</h3>
-                    <p>${article.summary}</p>
-                    <div class="metadata">
-                        <span class="source">Source: ${article.source}</span>
-                    </div>
-                    <a href="${article.url}" target="_blank">Read More</a>
-                </div>
-            `).join("");
+// Coalesce digests arriving close together into one render per frame
+function scheduleRender() {
+    if (renderScheduled) return;
+    renderScheduled = true;
+    requestAnimationFrame(render);
+}
+
+// Revalidate one endpoint against its cached ETag and re-render only if it changed
+async function refreshDigest(endpoint) {
+    const cached = digests.get(endpoint);
+    const headers = cached && cached.etag ? { "If-None-Match": cached.etag } : {};
+
+    try {
+        const response = await fetch(endpoint, { headers, cache: "no-store" });
+        if (response.status === 304) return;
+
+        const data = await response.json();
+        if (data.error) {
+            // Keep showing a previously cached digest rather than replacing it with an error
+            if (!cached || cached.error) {
+                digests.set(endpoint, { error: data.error });
+                scheduleRender();
+            }
+            return;
         }
+
+        const digest = { etag: response.headers.get("ETag"), articles: data };
+        digests.set(endpoint, digest);
+        saveCachedDigest(endpoint, digest);
+        scheduleRender();
     } catch (error) {
-        console.error("Error fetching articles:", error);
+        console.error(`Error fetching ${endpoint}:`, error);
     }
 }
 
+// Paint cached digests immediately, then refresh every source in parallel
+function fetchAllArticles() {
+    for (const endpoint of ENDPOINTS) {
+        const cached = loadCachedDigest(endpoint);
+        if (cached && Array.isArray(cached.articles)) digests.set(endpoint, cached);
+    }
+    render();
+
+    const sentinel = document.getElementById("articles-sentinel");
+    const observer = new IntersectionObserver((entries) => {
+        if (entries.some(entry => entry.isIntersecting) && renderedCount < items.length) {
+            appendCards(CHUNK_SIZE);
+            // Re-observe so a sentinel that is still in view triggers the next chunk
+            observer.unobserve(sentinel);
+            observer.observe(sentinel);
+        }
+    }, { rootMargin: "800px" });
+    observer.observe(sentinel);
+
+    ENDPOINTS.forEach(refreshDigest);
+}
+
 // Initial fetch for all articles
 fetchAllArticles();
@@ -0,0 +1,22 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+sys.path.insert(0, ROOT)
+
+# app.py opens its article index on import; keep tests away from the real newsapp.db
+os.environ.setdefault("NEWSAPP_DB", os.path.join(tempfile.mkdtemp(), "newsapp.db"))
+
+
+@pytest.fixture
+def fixture_html():
+    """Read a page from tests/fixtures"""
+    def read(name):
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+            return f.read()
+    return read
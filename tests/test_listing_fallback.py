@@ -0,0 +1,109 @@
+import pytest
+
+import http_client
+import scraper_news18
+from scraper_news18 import News18Scraper
+
+NEWS18_ECONOMY = "https://www.news18.com/business/economy"
+MINT_LATEST = "https://www.livemint.com/latest-news"
+
+
+class FakeResponse:
+    def __init__(self, html):
+        self.text = html
+        self.content = html.encode("utf-8")
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def listing(monkeypatch):
+    """
+    Serve fixed static HTML for every upstream GET and fixed HTML from the headless
+    renderer of the given module. Returns the list of URLs the renderer was asked for.
+    """
+    def serve(module, static, rendered):
+        renders = []
+
+        def fake_render(url):
+            renders.append(url)
+            return rendered
+
+        monkeypatch.setattr(http_client, "get", lambda url, headers=None, timeout=None: FakeResponse(static))
+        monkeypatch.setattr(module, "render_page", fake_render)
+        return renders
+
+    return serve
+
+
+def test_news18_enough_static_links_skips_rendering(listing, fixture_html):
+    renders = listing(scraper_news18, fixture_html("news18_static_full.html"), fixture_html("js_listing.html"))
+
+    links = News18Scraper().discover_article_links(NEWS18_ECONOMY, limit=5)
+
+    assert len(links) == 5
+    assert renders == []
+
+
+def test_news18_too_few_static_links_uses_rendered_page(listing, fixture_html):
+    renders = listing(scraper_news18, fixture_html("news18_static_sparse.html"), fixture_html("news18_static_full.html"))
+
+    links = News18Scraper().discover_article_links(NEWS18_ECONOMY, limit=5)
+
+    assert len(links) == 5
+    assert renders == [NEWS18_ECONOMY]
+
+
+def test_news18_rendered_page_without_more_links_is_ignored(listing, fixture_html):
+    static = fixture_html("news18_static_sparse.html")
+    rendered = static.replace("<title>Economy News - News18</title>", "<title>Rendered</title>")
+    renders = listing(scraper_news18, static, rendered)
+
+    soup = News18Scraper().get_listing_soup(NEWS18_ECONOMY, 5)
+
+    assert renders == [NEWS18_ECONOMY]
+    assert soup.title.string == "Economy News - News18"
+
+
+def test_news18_failed_render_keeps_static_page(listing, fixture_html):
+    renders = listing(scraper_news18, fixture_html("news18_static_sparse.html"), None)
+
+    links = News18Scraper().discover_article_links(NEWS18_ECONOMY, limit=5)
+
+    assert renders == [NEWS18_ECONOMY]
+    assert links == ["https://www.news18.com/business/economy/gdp-growth-beats-estimates-9000.html"]
+
+
+@pytest.fixture(scope="module")
+def app_module():
+    import app
+    return app
+
+
+def test_mint_enough_static_links_skips_rendering(app_module, listing, fixture_html):
+    renders = listing(app_module, fixture_html("mint_static_full.html"), fixture_html("mint_static_full.html"))
+
+    headlines = app_module.fetch_mint_headlines(MINT_LATEST, limit=5)
+
+    assert len(headlines) == 5
+    assert renders == []
+
+
+def test_mint_too_few_static_links_uses_rendered_page(app_module, listing, fixture_html):
+    renders = listing(app_module, fixture_html("mint_static_sparse.html"), fixture_html("mint_static_full.html"))
+
+    headlines = app_module.fetch_mint_headlines(MINT_LATEST, limit=5)
+
+    assert renders == [MINT_LATEST]
+    assert [h["url"] for h in headlines][-1] == "https://www.livemint.com/economy/jobs-report-115.html"
+    assert len(headlines) == 5
+
+
+def test_mint_rendered_page_without_more_links_is_ignored(app_module, listing, fixture_html):
+    renders = listing(app_module, fixture_html("mint_static_sparse.html"), "<html><body></body></html>")
+
+    headlines = app_module.fetch_mint_headlines(MINT_LATEST, limit=5)
+
+    assert renders == [MINT_LATEST]
+    assert [h["headline"] for h in headlines] == ["GDP growth beats estimates"]
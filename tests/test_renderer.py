@@ -0,0 +1,69 @@
+import functools
+import threading
+from concurrent.futures import Future, TimeoutError
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from bs4 import BeautifulSoup
+
+import renderer
+from conftest import FIXTURES
+from renderer import RenderPool
+from scraper_news18 import News18Scraper
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    """Serve tests/fixtures over HTTP on a free local port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=FIXTURES))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope="module")
+def render_pool():
+    pytest.importorskip("playwright.sync_api")
+    pool = RenderPool(size=1)
+    if not pool.broken:
+        pool._start()
+        pool._wait_ready(60)
+    if pool.broken:
+        pytest.skip("Chromium for playwright is not installed")
+    return pool
+
+
+def test_render_returns_js_built_links(render_pool, fixture_server):
+    url = f"{fixture_server}/js_listing.html"
+    scraper = News18Scraper()
+
+    static = BeautifulSoup(requests.get(url, timeout=5).text, "html.parser")
+    assert scraper.relevant_urls(static, 10) == []
+
+    rendered = BeautifulSoup(render_pool.render(url, timeout=10), "html.parser")
+    links = scraper.relevant_urls(rendered, 10)
+    assert len(links) == 6
+    assert "https://www.news18.com/business/economy/rbi-holds-repo-rate-9001.html" in links
+
+
+def test_timed_out_job_is_cancelled(monkeypatch):
+    monkeypatch.setattr(renderer, "RENDER_QUEUE_WAIT", 0)
+    pool = RenderPool(size=1)
+    # A launched browser that never takes the job, as when every page is busy
+    pool.broken = False
+    launched = Future()
+    launched.set_result(True)
+    pool._launches = [launched]
+
+    with pytest.raises(TimeoutError):
+        pool.render("http://127.0.0.1/listing", timeout=1.1)
+
+    _, _, future = pool._jobs.get_nowait()
+    assert future.cancelled()
@@ -0,0 +1,129 @@
+import json
+import os
+import sqlite3
+import time
+
+# Queue database shared by every crawl worker. Workers on other machines must see it
+# on a filesystem with working POSIX locks for SQLite's locking to be safe.
+QUEUE_DB = os.getenv("CRAWL_QUEUE_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "crawl_queue.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedupe_key TEXT UNIQUE,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_expires REAL,
+    worker TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, available_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(status, lease_expires);
+"""
+
+
+class Job:
+    def __init__(self, row):
+        self.id = row[0]
+        self.kind = row[1]
+        self.payload = json.loads(row[2])
+        self.attempts = row[3]
+
+
+class WorkQueue:
+    """
+    SQLite-backed job queue with leases. A leased job that is not completed before its
+    lease expires is handed to another worker; failed jobs are retried with exponential
+    backoff until max_attempts, then marked dead.
+    """
+
+    def __init__(self, db_path=QUEUE_DB, lease_seconds=120, max_attempts=5, retry_delay=30):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        # Autocommit mode so each operation can take the write lock explicitly
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def enqueue(self, kind, payload, dedupe_key=None, delay=0):
+        """Add a job; returns False if a job with the same dedupe_key already exists"""
+        now = time.time()
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO jobs (kind, payload, dedupe_key, available_at, created_at) VALUES (?, ?, ?, ?, ?)",
+            (kind, json.dumps(payload), dedupe_key, now + delay, now),
+        )
+        return cursor.rowcount == 1
+
+    def lease(self, worker_id):
+        """Claim the oldest runnable job for worker_id, or return None if there is none"""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Expired leases that already used up their attempts will not be retried
+            self.conn.execute(
+                "UPDATE jobs SET status = 'dead', last_error = 'lease expired', finished_at = ? "
+                "WHERE status = 'leased' AND lease_expires <= ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            row = self.conn.execute(
+                """
+                SELECT id, kind, payload, attempts FROM jobs
+                WHERE (status = 'pending' AND available_at <= ?)
+                   OR (status = 'leased' AND lease_expires <= ?)
+                ORDER BY available_at
+                LIMIT 1
+                """,
+                (now, now),
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+
+            self.conn.execute(
+                "UPDATE jobs SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker_id, now + self.lease_seconds, row[0]),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        job = Job(row)
+        job.attempts += 1
+        return job
+
+    def complete(self, job, worker_id):
+        """Mark a leased job as done; returns False if the lease was lost to another worker"""
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = 'done', finished_at = ?, lease_expires = NULL "
+            "WHERE id = ? AND status = 'leased' AND worker = ?",
+            (time.time(), job.id, worker_id),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job, worker_id, error):
+        """Schedule a retry with exponential backoff, or mark the job dead after max_attempts"""
+        now = time.time()
+        if job.attempts >= self.max_attempts:
+            status, available_at, finished_at = 'dead', now, now
+        else:
+            status, available_at, finished_at = 'pending', now + self.retry_delay * 2 ** (job.attempts - 1), None
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, available_at = ?, finished_at = ?, last_error = ?, lease_expires = NULL "
+            "WHERE id = ? AND status = 'leased' AND worker = ?",
+            (status, available_at, finished_at, str(error)[:1000], job.id, worker_id),
+        )
+
+    def stats(self):
+        """Job counts by status"""
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self):
+        self.conn.close()